@@ -15,33 +15,108 @@ We need to extract the actual parameters from the "parameters" field.
 
 Endpoints:
 - POST /search - Search ArXiv papers (called by Subconscious)
+  - POST /search?stream=1 - Same search streamed as NDJSON, one paper per line
 - GET /health - Health check
 """
 
+import asyncio
 import logging
-import json
-from typing import Optional, List
-from datetime import datetime
+import os
+import sys
+import threading
+from typing import AsyncIterator, Iterator, Optional, List, Tuple, Union
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import arxiv
+import msgspec
+from cachetools import TTLCache
 
-# Configure logging - verbose
+# Configure logging - set LOG_LEVEL=DEBUG to dump full incoming requests
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+
+# GZipMiddleware passes through any response that already declares a
+# Content-Encoding; streamed responses are tagged with this on the way in and
+# it is stripped again before it reaches the client
+_PASSTHROUGH_ENCODING = (b"content-encoding", b"identity")
+
+
+class StreamAwareGZipMiddleware:
+    """
+    GZipMiddleware that sends streamed NDJSON search results as-is.
+    
+    gzip would hold NDJSON lines back until its window fills, stalling the
+    stream. Relies only on GZipMiddleware skipping pre-encoded responses,
+    not on its responder internals.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(self._tag_streams, minimum_size=minimum_size, compresslevel=compresslevel)
+    
+    async def _tag_streams(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if "content-encoding" not in headers and headers.get("content-type", "").startswith("application/x-ndjson"):
+                    message = {**message, "headers": [*headers.raw, _PASSTHROUGH_ENCODING]}
+            await send(message)
+        
+        await self.app(scope, receive, send_tagged)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_untagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = message.get("headers", [])
+                if any(tuple(header) == _PASSTHROUGH_ENCODING for header in raw):
+                    message = {**message, "headers": [h for h in raw if tuple(h) != _PASSTHROUGH_ENCODING]}
+            await send(message)
+        
+        await self.gzip(scope, receive, send_untagged)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ArXiv Tool Server",
     description="ArXiv search microservice for Subconscious agent integration",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Shared ArXiv client - reuses one requests.Session so connections to
+# export.arxiv.org stay keep-alive across /search calls.
+# page_size matches the max_results cap, so every search is a single page.
+_ARXIV_CLIENT = arxiv.Client(page_size=50, delay_seconds=3.0, num_retries=3)
+# The client keeps rate-limit state and a shared session, and searches now
+# run in worker threads - serialize access (ArXiv allows ~1 request / 3s anyway)
+_ARXIV_LOCK = threading.Lock()
+
+# Subconscious tool-call wrappers are a few hundred bytes; anything larger
+# is a misbehaving caller and is rejected before it is read or logged
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(64 * 1024)))
+
+# Read-through cache of /search results, keyed on the normalized
+# (query, max_results). Agents retry and repeat the same tool calls, and the
+# ArXiv index changes slowly, so a 10 minute TTL is safe. Values are the
+# paper dicts, not encoded bodies - the response echoes the caller's own
+# query string, which differs between requests sharing a key.
+_SEARCH_CACHE: "TTLCache[Tuple[str, int], List[dict]]" = TTLCache(maxsize=1024, ttl=600)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
 # CORS - allow Subconscious to call this service
 app.add_middleware(
     CORSMiddleware,
@@ -51,28 +126,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress batched search results (~50-100 KB of abstracts for 50 papers);
+# small bodies like /health and the NDJSON stream go out as-is
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Request/Response Models
 
-class SearchParameters(BaseModel):
+# Request Models
+
+class SearchParameters(msgspec.Struct):
     """The actual search parameters inside the Subconscious wrapper."""
-    query: str = Field(..., description="Search query for ArXiv papers")
-    max_results: int = Field(10, ge=1, le=50, description="Maximum number of results")
-    
-    @validator('max_results', pre=True, always=True)
-    def coerce_max_results(cls, v):
-        """Handle max_results as string or int or missing."""
-        if v is None:
-            return 10
-        if isinstance(v, str):
-            try:
-                return int(v)
-            except ValueError:
-                return 10
-        return v
-
-
-class SubconsciousToolRequest(BaseModel):
+    query: Optional[str] = None
+    # Agents send this as int, float, string or bool - coerced in the handler
+    max_results: Union[int, float, str, bool, None] = 10
+
+
+class SubconsciousToolRequest(msgspec.Struct):
     """
     Request format that Subconscious sends when calling tools.
     
@@ -82,38 +150,149 @@ class SubconsciousToolRequest(BaseModel):
         "parameters": {"query": "...", "max_results": 10},
         "request_id": "request-..."
     }
+    
+    msgspec Structs ignore unknown fields by default. parameters is kept
+    raw and only decoded when it is a JSON object - any other value falls
+    back to the direct fields, as before.
     """
     tool_name: Optional[str] = None
-    parameters: Optional[dict] = None
+    parameters: msgspec.Raw = msgspec.Raw()
     request_id: Optional[str] = None
     
     # Also allow direct parameters for backwards compatibility
     query: Optional[str] = None
-    max_results: Optional[int] = 10
+    max_results: Union[int, float, str, bool, None] = 10
+
+
+# Built once per process - decoding goes straight from bytes to Structs
+_req_decoder = msgspec.json.Decoder(SubconsciousToolRequest)
+_params_decoder = msgspec.json.Decoder(SearchParameters)
+_resp_encoder = msgspec.json.Encoder()
+
+
+def _encode_search(papers: List[dict], query: str) -> bytes:
+    """
+    Encode the /search response body directly with msgspec.
     
-    class Config:
-        extra = "ignore"
+    Skips FastAPI's jsonable_encoder and Pydantic re-validation - we own the
+    data, so the payload (up to 50 papers) goes straight to the C encoder.
+    """
+    return _resp_encoder.encode({"papers": papers, "total": len(papers), "query": query})
 
 
-class Paper(BaseModel):
-    """A paper returned from ArXiv."""
-    title: str
-    authors: List[str]
-    abstract: str
-    published: str
-    updated: Optional[str] = None
-    arxiv_id: str
-    url: str
-    pdf_url: str
-    categories: List[str]
-    primary_category: str
+def _json_response(body: bytes) -> Response:
+    """Wrap pre-encoded JSON bytes in a response."""
+    return Response(body, media_type="application/json")
 
 
-class SearchResponse(BaseModel):
-    """Response from ArXiv search."""
-    papers: List[Paper]
-    total: int
-    query: str
+async def read_body_fast(
+    request: Request, max_bytes: Optional[int] = None
+) -> Union[bytes, bytearray]:
+    """
+    Read the request body into a buffer preallocated from Content-Length.
+    
+    Avoids Starlette's chunk-list append + join for sized bodies. Falls back
+    to request.body() when Content-Length is missing (chunked uploads).
+    
+    Raises:
+        HTTPException: 413 if the body is larger than max_bytes - checked
+            against Content-Length before anything is read or allocated
+    """
+    content_length = request.headers.get("content-length")
+    if not content_length or not content_length.isdigit():
+        body = await request.body()
+        if max_bytes is not None and len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail="Payload too large")
+        return body
+    
+    size = int(content_length)
+    if max_bytes is not None and size > max_bytes:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    
+    buf = bytearray(size)
+    offset = 0
+    async for chunk in request.stream():
+        end = offset + len(chunk)
+        if end > len(buf):
+            raise HTTPException(status_code=400, detail="Request body exceeds Content-Length")
+        buf[offset:end] = chunk
+        offset = end
+    
+    # A short body (client aborted) returns only what actually arrived
+    return buf if offset == len(buf) else buf[:offset]
+
+
+def _paper_dict(result: arxiv.Result) -> dict:
+    """Convert an ArXiv result to the plain paper dict returned to callers."""
+    # Truncate abstract if too long
+    abstract = result.summary
+    if len(abstract) > 1000:
+        abstract = abstract[:1000] + "..."
+    
+    # Authors and categories repeat heavily across searches on a topic -
+    # intern them so concurrent requests share one string object each
+    return {
+        "title": result.title,
+        "authors": [sys.intern(author.name) for author in result.authors],
+        "abstract": abstract,
+        "published": result.published.isoformat() if result.published else "",
+        "updated": result.updated.isoformat() if result.updated else None,
+        "arxiv_id": result.entry_id.rsplit("/", 1)[-1],
+        "url": result.entry_id,
+        "pdf_url": result.pdf_url or "",
+        "categories": [sys.intern(category) for category in result.categories],
+        "primary_category": sys.intern(result.primary_category or ""),
+    }
+
+
+def _build_search(query: str, max_results: int) -> arxiv.Search:
+    """Build a relevance-sorted ArXiv search."""
+    return arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.Relevance,
+        sort_order=arxiv.SortOrder.Descending
+    )
+
+
+def _do_search(query: str, max_results: int) -> List[dict]:
+    """
+    Run a full ArXiv search and return plain paper dicts.
+    
+    Blocking (the arxiv client uses requests) - call via asyncio.to_thread.
+    """
+    with _ARXIV_LOCK:
+        return [_paper_dict(result) for result in _ARXIV_CLIENT.results(_build_search(query, max_results))]
+
+
+def _next_result(results: Iterator[arxiv.Result]) -> Optional[arxiv.Result]:
+    """Advance a shared-client result iterator under the client lock."""
+    with _ARXIV_LOCK:
+        return next(results, None)
+
+
+async def _stream_papers(search: arxiv.Search) -> AsyncIterator[bytes]:
+    """
+    Yield papers as NDJSON lines as soon as ArXiv returns them.
+    
+    The arxiv client is synchronous, so each next() runs in a worker thread
+    to keep the event loop free. Must stay an async generator - Starlette
+    iterates sync generators through the threadpool, which is far slower.
+    """
+    results = _ARXIV_CLIENT.results(search)
+    count = 0
+    try:
+        while True:
+            result = await asyncio.to_thread(_next_result, results)
+            if result is None:
+                break
+            count += 1
+            yield _resp_encoder.encode(_paper_dict(result)) + b"\n"
+    except Exception as e:
+        # Headers are already sent - end the stream with what we have
+        logger.exception("ArXiv stream failed after %d papers: %s", count, e)
+    else:
+        logger.info("Streamed %d papers for query: %s", count, search.query)
 
 
 # Endpoints
@@ -134,69 +313,67 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "arxiv-tool-server"}
+    return ORJSONResponse({"status": "healthy", "service": "arxiv-tool-server"})
 
 
-@app.post("/search")
-async def search_papers(request: Request):
+@app.post("/search", response_class=ORJSONResponse)
+async def search_papers(request: Request, stream: bool = False):
     """
     Search ArXiv for papers.
     
     This endpoint is called by Subconscious during agent execution.
     Handles both Subconscious wrapped format and direct parameters.
+    
+    With ?stream=1 the papers are streamed as NDJSON instead of one batched
+    JSON object, so clients can render the first paper before the rest
+    arrive. Streaming bypasses the response cache.
     """
-    # ============================================================
-    # DEBUG: Log everything about the incoming request
-    # ============================================================
-    logger.info("=" * 70)
-    logger.info("[DEBUG] === INCOMING REQUEST ===")
-    logger.info(f"[DEBUG] Headers: {dict(request.headers)}")
-    logger.info(f"[DEBUG] Content-Type: {request.headers.get('content-type', 'NOT SET')}")
+    # Computed once - the request dump below is skipped unless LOG_LEVEL=DEBUG
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     # Read raw body
     try:
-        raw_body = await request.body()
-        raw_str = raw_body.decode('utf-8')
-        logger.info(f"[DEBUG] Raw body (string): {raw_str}")
-        logger.info(f"[DEBUG] Raw body length: {len(raw_str)} bytes")
+        raw_body = await read_body_fast(request, max_bytes=MAX_BODY_BYTES)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"[DEBUG] Failed to read body: {e}")
+        logger.error("Failed to read body: %s", e)
         raise HTTPException(status_code=400, detail=f"Could not read request body: {e}")
     
-    # Parse JSON
+    if debug:
+        logger.debug("=== INCOMING REQUEST ===")
+        logger.debug("Headers: %s", dict(request.headers))
+        logger.debug("Raw body (%d bytes): %s", len(raw_body), raw_body.decode("utf-8", "replace"))
+    
+    # Decode JSON straight into the request Struct (bytes in, struct out)
     try:
-        body = json.loads(raw_str)
-        logger.info(f"[DEBUG] Parsed JSON: {body}")
-        logger.info(f"[DEBUG] JSON type: {type(body)}")
-        if isinstance(body, dict):
-            logger.info(f"[DEBUG] JSON keys: {list(body.keys())}")
-            for key, value in body.items():
-                logger.info(f"[DEBUG]   {key}: {value} (type: {type(value).__name__})")
-    except json.JSONDecodeError as e:
-        logger.error(f"[DEBUG] JSON parse error: {e}")
+        body = _req_decoder.decode(raw_body)
+    except msgspec.DecodeError as e:
+        # ValidationError is a DecodeError subclass - covers bad JSON and bad shapes
+        logger.error("JSON parse error: %s", e)
         raise HTTPException(status_code=422, detail=f"Invalid JSON: {e}")
     
     # ============================================================
     # Extract parameters - handle both formats
     # ============================================================
-    query = None
-    max_results = 10
-    
     # Check if this is Subconscious wrapped format
-    if "parameters" in body and isinstance(body.get("parameters"), dict):
-        logger.info("[DEBUG] Detected Subconscious wrapped format - extracting from 'parameters'")
-        params = body["parameters"]
-        query = params.get("query")
-        max_results = params.get("max_results", 10)
+    wrapped = memoryview(body.parameters)[:1] == b"{"
+    if wrapped:
+        try:
+            params = _params_decoder.decode(body.parameters)
+        except msgspec.DecodeError as e:
+            logger.error("Invalid parameters: %s", e)
+            raise HTTPException(status_code=422, detail=f"Invalid JSON: {e}")
+        query = params.query
+        max_results = params.max_results
     else:
         # Direct format (backwards compatibility)
-        logger.info("[DEBUG] Using direct format")
-        query = body.get("query")
-        max_results = body.get("max_results", 10)
+        query = body.query
+        max_results = body.max_results
     
     # Validate
     if not query:
-        logger.error("[DEBUG] No query found in request")
+        logger.error("No query found in request")
         raise HTTPException(status_code=422, detail="Missing 'query' parameter")
     
     # Coerce max_results
@@ -206,72 +383,61 @@ async def search_papers(request: Request):
         except ValueError:
             max_results = 10
     
-    max_results = max(1, min(50, max_results or 10))
+    max_results = max(1, min(50, int(max_results or 10)))
+    
+    if debug:
+        logger.debug(
+            "Parsed %s format: query=%r max_results=%d",
+            "wrapped" if wrapped else "direct", query, max_results,
+        )
+    
+    if stream:
+        logger.info("Streaming ArXiv search for: %s (max: %d)", query, max_results)
+        return StreamingResponse(
+            _stream_papers(_build_search(query, max_results)),
+            media_type="application/x-ndjson",
+        )
     
-    logger.info(f"[DEBUG] Extracted parameters:")
-    logger.info(f"[DEBUG]   query: '{query}'")
-    logger.info(f"[DEBUG]   max_results: {max_results}")
-    logger.info("=" * 70)
+    cache_key = (query.strip().lower(), max_results)
+    with _SEARCH_CACHE_LOCK:
+        cached = _SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Cache hit for: %s (max: %d)", query, max_results)
+        return _json_response(_encode_search(cached, query))
     
     # ============================================================
     # Actual ArXiv search
     # ============================================================
-    logger.info(f"Searching ArXiv for: {query} (max: {max_results})")
+    logger.info("Searching ArXiv for: %s (max: %d)", query, max_results)
     
     try:
-        # Create ArXiv search client
-        client = arxiv.Client()
-        
-        # Build search query
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance,
-            sort_order=arxiv.SortOrder.Descending
-        )
-        
-        # Execute search
-        papers = []
-        for result in client.results(search):
-            # Truncate abstract if too long
-            abstract = result.summary
-            if len(abstract) > 1000:
-                abstract = abstract[:1000] + "..."
-            
-            papers.append(Paper(
-                title=result.title,
-                authors=[author.name for author in result.authors],
-                abstract=abstract,
-                published=result.published.isoformat() if result.published else "",
-                updated=result.updated.isoformat() if result.updated else None,
-                arxiv_id=result.entry_id.split("/")[-1],
-                url=result.entry_id,
-                pdf_url=result.pdf_url or "",
-                categories=list(result.categories),
-                primary_category=result.primary_category or ""
-            ))
+        # Execute search off the event loop so /health and other requests
+        # are served while ArXiv responds
+        papers = await asyncio.to_thread(_do_search, query, max_results)
         
-        logger.info(f"Found {len(papers)} papers for query: {query}")
-        
-        response = SearchResponse(
-            papers=papers,
-            total=len(papers),
-            query=query
-        )
-        
-        logger.info(f"[DEBUG] Returning {len(papers)} papers")
-        return response
+        logger.info("Found %d papers for query: %s", len(papers), query)
+        with _SEARCH_CACHE_LOCK:
+            _SEARCH_CACHE[cache_key] = papers
+        return _json_response(_encode_search(papers, query))
         
     except Exception as e:
-        logger.exception(f"ArXiv search failed: {e}")
+        logger.exception("ArXiv search failed: %s", e)
         # Return empty result instead of error (more graceful for agent)
-        return SearchResponse(
-            papers=[],
-            total=0,
-            query=query
-        )
+        # Failures are not cached so the next call retries ArXiv
+        return _json_response(_encode_search([], query))
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # uvloop + httptools from uvicorn[standard]; access log off since
+    # every search is already logged by the handler
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "1")),
+        log_level=LOG_LEVEL.lower(),
+        access_log=False,
+    )
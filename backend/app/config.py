@@ -6,7 +6,7 @@ Loads from environment variables and .env file.
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from typing import Optional, List
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -40,14 +40,19 @@ class Settings(BaseSettings):
     # Set as comma-separated: CORS_ORIGINS=https://app.vercel.app,http://localhost:3000
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
     
-    def get_cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string."""
+    @cached_property
+    def _cors_origins(self) -> List[str]:
+        """CORS origins parsed once per Settings instance."""
         return [
             origin.strip().rstrip('/')  # Remove trailing slashes
             for origin in self.CORS_ORIGINS.split(',') 
             if origin.strip()
         ]
     
+    def get_cors_origins_list(self) -> List[str]:
+        """Parse CORS origins from comma-separated string (cached)."""
+        return self._cors_origins
+    
     # Retry Configuration for TIM Engine Warmup
     MAX_RETRIES: int = 5
     RETRY_DELAY: float = 10.0
@@ -56,6 +61,20 @@ class Settings(BaseSettings):
     REQUEST_TIMEOUT: int = 120
     STREAM_TIMEOUT: int = 300
     
+    # Concurrent analysis streams (each holds an SDK thread and an upstream run)
+    MAX_CONCURRENT_STREAMS: int = 64
+    MAX_STREAMS_PER_CLIENT: int = 4
+    
+    # Reverse proxies in front of the app that append to X-Forwarded-For.
+    # The client is read that many hops from the right; 0 (local runs, no
+    # proxy) ignores the header and uses the socket peer address. Set to 1
+    # behind Railway/Render.
+    TRUSTED_PROXY_HOPS: int = 0
+    
+    # asyncio default executor threads for short blocking calls (e.g. cancel),
+    # per worker process - one more thread per stream is added on top
+    RESEARCH_THREAD_POOL_SIZE: int = 32
+    
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
@@ -63,6 +82,25 @@ class Settings(BaseSettings):
     }
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get settings instance."""
+    """
+    Get the settings instance.
+    
+    Cached so .env is read and validated once per process rather than on
+    every request that touches configuration.
+    """
     return Settings()
+
+
+def reload_settings() -> Settings:
+    """
+    Drop the cached settings and re-read the environment (dev hot-reload).
+    
+    Also drops cached SubconsciousService instances, which copy their
+    configuration from the settings when created.
+    """
+    get_settings.cache_clear()
+    from app.services.subconscious import get_subconscious_service
+    get_subconscious_service.cache_clear()
+    return get_settings()
@@ -2,11 +2,18 @@
 Research Paper Analyzer - Backend API
 """
 
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import get_settings
 from app.routes import health, research
@@ -24,6 +31,50 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 
+# GZipMiddleware passes through any response that already declares a
+# Content-Encoding; streamed responses are tagged with this on the way in and
+# it is stripped again before it reaches the client
+_PASSTHROUGH_ENCODING = (b"content-encoding", b"identity")
+
+
+class StreamAwareGZipMiddleware:
+    """
+    GZipMiddleware that sends Server-Sent Event streams as-is.
+    
+    gzip would hold SSE frames back until its window fills, stalling the
+    stream. Relies only on GZipMiddleware skipping pre-encoded responses,
+    not on its responder internals.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(self._tag_streams, minimum_size=minimum_size, compresslevel=compresslevel)
+    
+    async def _tag_streams(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if "content-encoding" not in headers and headers.get("content-type", "").startswith("text/event-stream"):
+                    message = {**message, "headers": [*headers.raw, _PASSTHROUGH_ENCODING]}
+            await send(message)
+        
+        await self.app(scope, receive, send_tagged)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_untagged(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                raw = message.get("headers", [])
+                if any(tuple(header) == _PASSTHROUGH_ENCODING for header in raw):
+                    message = {**message, "headers": [h for h in raw if tuple(h) != _PASSTHROUGH_ENCODING]}
+            await send(message)
+        
+        await self.gzip(scope, receive, send_untagged)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -39,9 +90,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"Retry Delay: {settings.RETRY_DELAY}s (exponential backoff)")
     logger.info("=" * 60)
     
+    # Explicitly sized default executor for to_thread/run_in_executor calls,
+    # instead of asyncio's min(32, cpu + 4) which varies with the host. Each
+    # open research stream holds one thread for its whole lifetime, so reserve
+    # one per admitted stream on top of the pool for short blocking calls.
+    # Threads are only spawned on demand.
+    default_pool = ThreadPoolExecutor(
+        max_workers=settings.MAX_CONCURRENT_STREAMS + settings.RESEARCH_THREAD_POOL_SIZE,
+        thread_name_prefix="default-",
+    )
+    asyncio.get_running_loop().set_default_executor(default_pool)
+    
     yield
     
     logger.info("Shutting down")
+    default_pool.shutdown(wait=False, cancel_futures=True)
 
 
 # Create FastAPI application
@@ -50,12 +113,16 @@ app = FastAPI(
     description="AI-powered research paper analysis using Subconscious platform",
     version="2.0.0",
     lifespan=lifespan,
+    # Routes return plain dicts we own - serialize with orjson, no response_model
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 settings = get_settings()
-cors_origins = settings.get_cors_origins_list()
-logger.info(f"CORS Origins: {cors_origins}")
+# Parsed once at import. CORSMiddleware only tests `origin in allow_origins`,
+# so a frozenset makes the per-request origin check O(1).
+cors_origins = frozenset(settings.get_cors_origins_list())
+logger.info(f"CORS Origins: {sorted(cors_origins)}")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -64,6 +131,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses over 1 KB; text/event-stream is always sent as-is
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(research.router)
@@ -77,3 +147,19 @@ async def root():
         "version": "2.0.0",
         "docs": "/docs",
     }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    # uvloop + httptools from uvicorn[standard]; access log off since
+    # stream requests are already logged by the routes
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "1")),
+        log_level="info",
+        access_log=False,
+    )
@@ -8,13 +8,18 @@ IMPORTANT:
 - Use basic JSON Schema types only
 """
 
+from functools import lru_cache
 
+
+@lru_cache(maxsize=1)
 def get_analysis_schema() -> dict:
     """
     Get JSON Schema for research analysis output.
     
     This is a manual schema to ensure compatibility with Subconscious API.
     Pydantic's auto-generated schemas use '$defs' which may cause issues.
+    
+    Cached: the same dict is returned on every call - treat it as read-only.
     """
     return {
         "type": "object",
@@ -68,15 +68,6 @@ class RunResponse(BaseModel):
         populate_by_name = True
 
 
-# Request models
-
-class AnalyzeRequest(BaseModel):
-    """Request to analyze a research topic."""
-    topic: str = Field(..., min_length=3, max_length=500, description="Research topic to analyze")
-    use_structured_output: bool = Field(True, description="Whether to use structured output format")
-    include_arxiv: bool = Field(True, description="Whether to include ArXiv search")
-
-
 class StreamEvent(BaseModel):
     """Server-Sent Event for streaming responses."""
     type: str  # "delta", "done", "error"
@@ -87,5 +78,7 @@ class StreamEvent(BaseModel):
     error: Optional[str] = None
 
 
-# Rebuild model to resolve forward references
-Task.model_rebuild()
+# Pydantic v2 resolves Task's self-reference at class creation; only pay for
+# a rebuild if the schema was left incomplete.
+if not Task.__pydantic_complete__:
+    Task.model_rebuild()
@@ -3,42 +3,60 @@ Health check endpoints for the API with detailed diagnostics.
 """
 
 import logging
-from datetime import datetime
+from typing import Any, Dict
 
-from fastapi import APIRouter
-from app.config import get_settings
+import orjson
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
+from app.config import Settings, get_settings
 from app.models.schemas import get_analysis_schema
+from app.utils import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Handlers return ORJSONResponse instances directly: FastAPI passes returned
+# dicts through jsonable_encoder even when response_class is set.
 router = APIRouter(tags=["health"])
 
+# Liveness body never changes - serialized once at import
+_LIVE_BODY = orjson.dumps({"status": "alive"})
 
-@router.get("/health")
+# Config summary for /health, rebuilt only when the settings object changes
+_health_config_cache: Dict[str, Any] = {"settings": None, "config": None}
+
+
+def _health_config(settings: Settings) -> Dict[str, Any]:
+    """Get the /health config summary, cached per settings instance."""
+    cache = _health_config_cache
+    if cache["settings"] is not settings:
+        cache["config"] = {
+            "engine": settings.SUBCONSCIOUS_ENGINE,
+            "api_key_configured": bool(settings.SUBCONSCIOUS_API_KEY),
+            "arxiv_configured": bool(settings.ARXIV_SERVICE_URL),
+            "max_retries": settings.MAX_RETRIES,
+            "retry_delay": settings.RETRY_DELAY,
+            "stream_timeout": settings.STREAM_TIMEOUT,
+        }
+        cache["settings"] = settings
+    return cache["config"]
+
+
+@router.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """
     Basic health check endpoint.
     Returns service status and configuration summary.
     """
-    settings = get_settings()
-    
-    return {
+    return ORJSONResponse({
         "status": "healthy",
         "service": "research-paper-analyzer-backend",
         "version": "2.0.0",
-        "timestamp": datetime.now().isoformat(),
-        "config": {
-            "engine": settings.SUBCONSCIOUS_ENGINE,
-            "api_key_configured": bool(settings.SUBCONSCIOUS_API_KEY),
-            "arxiv_configured": bool(settings.ARXIV_SERVICE_URL),
-            "max_retries": settings.MAX_RETRIES,
-            "retry_delay": settings.RETRY_DELAY,
-            "stream_timeout": settings.STREAM_TIMEOUT,
-        }
-    }
+        "timestamp": now_iso(),
+        "config": _health_config(get_settings()),
+    })
 
 
-@router.get("/health/ready")
+@router.get("/health/ready", response_class=ORJSONResponse)
 async def readiness_check():
     """
     Readiness check - verifies configuration is complete.
@@ -54,9 +72,9 @@ async def readiness_check():
     if not settings.ARXIV_SERVICE_URL:
         issues.append("ARXIV_SERVICE_URL not configured (ArXiv search disabled)")
     
-    return {
+    return ORJSONResponse({
         "status": "ready" if not issues or (len(issues) == 1 and "ARXIV" in issues[0]) else "not_ready",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "config": {
             "engine": settings.SUBCONSCIOUS_ENGINE,
             "api_key_configured": bool(settings.SUBCONSCIOUS_API_KEY),
@@ -67,27 +85,25 @@ async def readiness_check():
             "request_timeout": settings.REQUEST_TIMEOUT,
         },
         "issues": issues if issues else None,
-    }
+    })
 
 
-@router.get("/health/live")
+@router.get("/health/live", response_class=ORJSONResponse)
 async def liveness_check():
     """
     Liveness check - simple endpoint to verify the service is running.
-    Used by container orchestration systems.
+    Used by container orchestration systems, which only look at the status
+    code - so the body is pre-serialized and carries no timestamp.
     """
-    return {
-        "status": "alive",
-        "timestamp": datetime.now().isoformat(),
-    }
+    return Response(_LIVE_BODY, media_type="application/json")
 
 
-@router.get("/debug/schema")
+@router.get("/debug/schema", response_class=ORJSONResponse)
 async def debug_schema():
     """
     Debug endpoint to view the answerFormat schema being sent to Subconscious.
     Useful for troubleshooting schema validation errors.
     """
-    return {
+    return ORJSONResponse({
         "answerFormat": get_analysis_schema()
-    }
+    })
@@ -9,52 +9,197 @@ Architecture Notes:
 Key Design Decisions:
 1. Async generator pattern: event_generator() is async and yields immediately
 2. Thread pool: Sync SDK runs in ThreadPoolExecutor, events flow via Queue
-3. Non-blocking: asyncio.to_thread() and queue.get() with timeouts
+3. Non-blocking: the SDK thread hands events to an asyncio.Queue on the loop
 4. Clean shutdown: Proper cancellation and resource cleanup
 """
 
-import json
+import asyncio
+import contextvars
+import hashlib
 import logging
+import time
 from datetime import datetime
-from typing import List, Optional, AsyncGenerator
+from types import MappingProxyType
+from typing import Callable, Dict, List, Literal, Optional, AsyncGenerator
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from sse_starlette.sse import EventSourceResponse
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field, field_validator
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+from starlette.background import BackgroundTask
 
+from app.config import get_settings
 from app.services.subconscious import (
     get_subconscious_service, 
     get_available_engines, 
     get_available_tools
 )
+from app.utils import now_iso
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/research", tags=["research"])
 
 
+def _static_json(payload: dict) -> tuple:
+    """Serialize a never-changing payload once and derive a strong ETag for it."""
+    body = orjson.dumps(payload)
+    return body, '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+# Engine and tool catalogues are module constants - serve them pre-encoded
+_ENGINES_BODY, _ENGINES_ETAG = _static_json({"engines": get_available_engines()})
+_TOOLS_BODY, _TOOLS_ETAG = _static_json({"tools": get_available_tools()})
+_ENGINE_COUNT = len(get_available_engines())
+_TOOL_COUNT = len(get_available_tools())
+
+
+# Response headers for every analysis stream (sse-starlette copies them).
+# No Connection header here: it is hop-by-hop and illegal on HTTP/2, and
+# sse-starlette adds it itself for the HTTP/1.1 hop to the proxy.
+_SSE_HEADERS = MappingProxyType({
+    "Cache-Control": "no-cache, no-transform",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+})
+
+_BANNER = "=" * 80
+
+# End-of-stream sentinel the frontend waits for, framed once (bytes pass
+# through sse-starlette untouched)
+_DONE_EVENT = ServerSentEvent(data="[DONE]").encode()
+
+
+class _StreamSlots:
+    """
+    Counts open analysis streams, overall and per client IP.
+    
+    Only touched from the event loop, so plain ints need no lock.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.per_client: Dict[str, int] = {}
+    
+    def reserve(self, client: str) -> Optional[Callable[[], None]]:
+        """Take a slot for client; returns an idempotent release, or None if full."""
+        settings = get_settings()
+        held = self.per_client.get(client, 0)
+        if self.total >= settings.MAX_CONCURRENT_STREAMS or held >= settings.MAX_STREAMS_PER_CLIENT:
+            return None
+        
+        self.total += 1
+        self.per_client[client] = held + 1
+        released = False
+        
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.total -= 1
+            remaining = self.per_client[client] - 1
+            if remaining:
+                self.per_client[client] = remaining
+            else:
+                del self.per_client[client]
+        
+        return release
+
+
+_stream_slots = _StreamSlots()
+
+
+def _client_key(request: Request) -> str:
+    """
+    Identify the caller for per-client stream limits.
+    
+    Behind Railway/Render every request comes from the proxy's address, so
+    X-Forwarded-For is used - but only the hops our own proxies appended,
+    counted from the right. Everything left of those is client-supplied.
+    """
+    hops = get_settings().TRUSTED_PROXY_HOPS
+    forwarded = request.headers.get("x-forwarded-for") if hops > 0 else None
+    if forwarded:
+        addresses = forwarded.split(",")
+        # Fewer entries than trusted hops: all of them came from our proxies
+        address = addresses[-hops if hops <= len(addresses) else 0].strip()
+        if address:
+            return address
+    return request.client.host if request.client else "unknown"
+
+
+def _cancel_abandoned_run(service, run_id: str) -> None:
+    """Cancel an upstream run whose client went away (runs in a worker thread)."""
+    try:
+        service.cancel_run(run_id)
+    except Exception:
+        # cancel_run already logged the failure; nothing else to do for a gone client
+        pass
+
+
+def _sse_frame(event: dict) -> bytes:
+    """
+    Frame an event as a complete SSE message.
+    
+    orjson output never contains raw CR/LF, so the payload is always a single
+    data line and the bytes can skip sse-starlette's formatter entirely.
+    join() copies the payload once, where chained + would copy a multi-MB
+    done event twice.
+    """
+    return b"".join((b"data: ", orjson.dumps(event), b"\r\n\r\n"))
+
+
+def _error_frame(message: str) -> bytes:
+    """Build the SSE frame for a stream-level error."""
+    return _sse_frame({"type": "error", "error": message})
+
+
+def _cached_json(request: Request, body: bytes, etag: str) -> Response:
+    """Return the pre-encoded body, or 304 if the client already has this ETag."""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# Built from the service's catalogues, so an engine or tool added there is
+# accepted here too
+EngineId = Literal[tuple(engine["id"] for engine in get_available_engines())]
+ToolId = Literal[tuple(tool["id"] for tool in get_available_tools())]
+
+
 class AnalyzeRequest(BaseModel):
     """Request body for analysis endpoints."""
     topic: str = Field(..., min_length=3, max_length=2000, description="Research topic or question")
-    engine: Optional[str] = Field(None, description="Engine to use (e.g., tim-gpt, tim-small-preview, tim-large)")
-    tools: Optional[List[str]] = Field(None, description="List of tool IDs to use (web_search, webpage_understanding, exa_search)")
+    engine: Optional[EngineId] = Field(None, description="Engine to use (e.g., tim-gpt, tim-small-preview, tim-large)")
+    tools: Optional[List[ToolId]] = Field(None, description="List of tool IDs to use (web_search, webpage_understanding, exa_search)")
     include_arxiv: bool = Field(True, description="Whether to include ArXiv academic paper search")
+    
+    @field_validator("topic", mode="before")
+    @classmethod
+    def strip_topic(cls, value):
+        """Strip surrounding whitespace before the length limits are checked."""
+        return value.strip() if isinstance(value, str) else value
 
 
 @router.get("/engines")
-async def list_engines():
+async def list_engines(request: Request):
     """Get list of available research engines."""
-    return {"engines": get_available_engines()}
+    return _cached_json(request, _ENGINES_BODY, _ENGINES_ETAG)
 
 
 @router.get("/tools")
-async def list_tools():
+async def list_tools(request: Request):
     """Get list of available platform tools."""
-    return {"tools": get_available_tools()}
+    return _cached_json(request, _TOOLS_BODY, _TOOLS_ETAG)
 
 
 @router.post("/analyze/stream")
-async def analyze_stream(request: AnalyzeRequest):
+async def analyze_stream(request: AnalyzeRequest, http_request: Request):
     """
     Streaming research analysis endpoint.
     
@@ -69,17 +214,38 @@ async def analyze_stream(request: AnalyzeRequest):
     The stream uses sse-starlette for proper event flushing without buffering delays.
     The backend runs the sync Subconscious SDK in a thread pool to avoid blocking
     the async event loop, ensuring immediate event delivery to clients.
+    
+    Returns 429 when the server-wide or per-client stream limit is reached.
     """
+    client = _client_key(http_request)
+    release_slot = _stream_slots.reserve(client)
+    if release_slot is None:
+        logger.warning(f"[ROUTE] Stream limit reached for {client} ({_stream_slots.total} open)")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many concurrent research streams. Please wait for one to finish.",
+            headers={"Retry-After": "10"},
+        )
+    
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    logger.info("=" * 80)
+    logger.info(_BANNER)
     logger.info(f"[ROUTE] NEW STREAM REQUEST at {timestamp}")
-    logger.info("=" * 80)
+    logger.info(_BANNER)
     logger.info(f"[ROUTE] Topic: {request.topic[:100]}{'...' if len(request.topic) > 100 else ''}")
     logger.info(f"[ROUTE] Engine: {request.engine or 'default'}")
     logger.info(f"[ROUTE] Tools: {request.tools or 'all'}")
     logger.info(f"[ROUTE] Include ArXiv: {request.include_arxiv}")
     
-    async def event_generator() -> AsyncGenerator[dict, None]:
+    # Once stream_async owns the slot it is freed when the SDK worker ends -
+    # an abandoned stream keeps its thread for a while after the response
+    slot_handed_off = False
+    
+    def release_unless_handed_off() -> None:
+        """Free the slot if stream_async never took it over."""
+        if not slot_handed_off:
+            release_slot()
+    
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """
         Async generator that yields SSE events.
         
@@ -87,11 +253,17 @@ async def analyze_stream(request: AnalyzeRequest):
         1. Creates a SubconsciousService instance
         2. Calls stream_async() which runs the SDK in a thread pool
         3. Yields events immediately as they arrive (non-blocking)
-        4. Handles cleanup on cancellation or error
+        4. Handles cleanup on cancellation or error, cancelling the upstream
+           run if the client disconnects before it finishes
         """
+        nonlocal slot_handed_off
         event_count = 0
         delta_count = 0
-        start_time = datetime.now()
+        service = None
+        active_run_id = None  # Upstream run still in flight, if any
+        start_time = time.monotonic()
+        # Per-event logs are INFO; skip their formatting work entirely above it
+        log_info = logger.isEnabledFor(logging.INFO)
         
         try:
             service = get_subconscious_service(engine=request.engine)
@@ -99,57 +271,70 @@ async def analyze_stream(request: AnalyzeRequest):
             logger.info(f"[ROUTE] Starting async stream iteration...")
             
             # Use the async streaming method - this doesn't block!
+            slot_handed_off = True
             async for event in service.stream_async(
                 topic=request.topic,
                 engine=request.engine,
                 tool_ids=request.tools,
-                include_arxiv=request.include_arxiv
+                include_arxiv=request.include_arxiv,
+                on_finished=release_slot,
             ):
                 event_count += 1
                 event_type = event.get("type", "unknown")
-                elapsed = (datetime.now() - start_time).total_seconds()
-                
-                # Detailed logging for debugging
                 if event_type == "delta":
                     delta_count += 1
-                    if delta_count <= 5 or delta_count % 20 == 0:
-                        content_len = len(str(event.get("content", "")))
-                        logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] DELTA #{delta_count} ({content_len} chars)")
-                elif event_type == "activity":
-                    delta_num = event.get("delta_count", 0)
-                    content_type = event.get("content_type", "?")
-                    if delta_num <= 5 or delta_num % 20 == 0:
-                        logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] ACTIVITY #{delta_num} ({content_type})")
-                elif event_type == "status":
-                    phase = event.get("phase", "?")
-                    message = event.get("message", "")[:50]
-                    logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] STATUS/{phase}: {message}")
-                elif event_type == "done":
-                    run_id = event.get("run_id", "?")
-                    answer = event.get("answer")
-                    answer_type = type(answer).__name__
-                    answer_len = len(str(answer)) if answer else 0
-                    reasoning_len = len(event.get("reasoning", []))
-                    logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] DONE: run_id={run_id}, answer={answer_type}({answer_len} chars), reasoning={reasoning_len} steps")
                 elif event_type == "run_started":
-                    run_id = event.get("run_id", "?")
-                    logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] RUN_STARTED: run_id={run_id}")
-                elif event_type == "error":
-                    error = event.get("error", "?")
-                    logger.error(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] ERROR: {error}")
+                    active_run_id = event.get("run_id")
+                elif event_type in ("done", "error"):
+                    active_run_id = None
+                
+                # Detailed logging for debugging
+                if log_info or event_type == "error":
+                    elapsed = time.monotonic() - start_time
+                    
+                    if event_type == "delta":
+                        if delta_count <= 5 or delta_count % 20 == 0:
+                            content = event.get("content")
+                            content_len = len(content) if hasattr(content, "__len__") else 0
+                            logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] DELTA #{delta_count} ({content_len} chars)")
+                    elif event_type == "activity":
+                        delta_num = event.get("delta_count", 0)
+                        if delta_num <= 5 or delta_num % 20 == 0:
+                            content_type = event.get("content_type", "?")
+                            logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] ACTIVITY #{delta_num} ({content_type})")
+                    elif event_type == "status":
+                        phase = event.get("phase", "?")
+                        message = event.get("message", "")[:50]
+                        logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] STATUS/{phase}: {message}")
+                    elif event_type == "done":
+                        run_id = event.get("run_id", "?")
+                        answer = event.get("answer")
+                        answer_type = type(answer).__name__
+                        # Sizes by reference - never stringify the payload just to log it
+                        answer_len = len(answer) if hasattr(answer, "__len__") else 0
+                        reasoning_len = len(event.get("reasoning") or ())
+                        logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] DONE: run_id={run_id}, answer={answer_type}({answer_len} chars), reasoning={reasoning_len} steps")
+                    elif event_type == "run_started":
+                        run_id = event.get("run_id", "?")
+                        logger.info(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] RUN_STARTED: run_id={run_id}")
+                    elif event_type == "error":
+                        error = event.get("error", "?")
+                        logger.error(f"[ROUTE] Event #{event_count} [{elapsed:.1f}s] ERROR: {error}")
                 
-                # Yield event data - sse-starlette handles formatting and flushing
-                yield {"data": json.dumps(event)}
+                # Yield the framed event - sse-starlette sends bytes as-is and flushes.
+                # Encoded inline even for large done payloads: orjson holds the
+                # GIL for the whole call, so to_thread() would not free the loop.
+                yield _sse_frame(event)
             
             # Stream complete
-            total_time = (datetime.now() - start_time).total_seconds()
+            total_time = time.monotonic() - start_time
             logger.info(f"[ROUTE] Stream iteration complete")
             logger.info(f"[ROUTE]   Total events: {event_count}")
             logger.info(f"[ROUTE]   Total deltas: {delta_count}")
             logger.info(f"[ROUTE]   Total time: {total_time:.1f}s")
             
             # Send done signal
-            yield {"data": "[DONE]"}
+            yield _DONE_EVENT
             logger.info(f"[ROUTE] Sent [DONE] signal")
             
         except GeneratorExit:
@@ -157,16 +342,27 @@ async def analyze_stream(request: AnalyzeRequest):
             raise
         except Exception as e:
             logger.exception(f"[ROUTE] Generator exception: {e}")
-            yield {"data": json.dumps({"type": "error", "error": str(e)})}
-            yield {"data": "[DONE]"}
+            yield _error_frame(str(e))
+            yield _DONE_EVENT
+        finally:
+            release_unless_handed_off()
+            if active_run_id and service is not None:
+                # sse-starlette cancels us on disconnect; stop the agent too
+                # instead of letting it burn tokens for nobody. Fire-and-forget:
+                # awaiting inside a cancelled scope would be cancelled again.
+                logger.warning(f"[ROUTE] Client left mid-run, cancelling {active_run_id}")
+                asyncio.get_running_loop().run_in_executor(
+                    None, contextvars.copy_context().run,
+                    _cancel_abandoned_run, service, active_run_id
+                )
     
     return EventSourceResponse(
         event_generator(),
-        headers={
-            "Cache-Control": "no-cache, no-transform",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        }
+        background=BackgroundTask(release_unless_handed_off),  # In case the generator never started
+        media_type="text/event-stream",
+        ping=15,  # Keep-alive comment so proxies don't drop long research runs
+        send_timeout=30,  # Give up on clients that stop reading
+        headers=_SSE_HEADERS,
     )
 
 
@@ -181,7 +377,8 @@ async def cancel_run(run_id: str):
     
     try:
         service = get_subconscious_service()
-        service.cancel_run(run_id)
+        # Blocking SDK call - keep it off the event loop
+        await asyncio.to_thread(service.cancel_run, run_id)
         
         return {
             "status": "cancelled",
@@ -201,7 +398,7 @@ async def health_check():
     """Health check endpoint for the research API."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "engines": len(get_available_engines()),
-        "tools": len(get_available_tools()),
+        "timestamp": now_iso(),
+        "engines": _ENGINE_COUNT,
+        "tools": _TOOL_COUNT,
     }
@@ -6,6 +6,8 @@ Architecture Notes:
 - We use asyncio.Queue to bridge sync generator → async generator
 - A background thread runs the sync SDK, pushing events to the queue
 - The async generator yields from the queue, allowing non-blocking SSE
+- Each retry attempt gets its own thread; backoff between attempts waits on
+  the event loop, so a retrying stream holds no thread
 
 Key Learnings:
 1. Delta events stream internal JSON - extract meaningful content for activity logs
@@ -19,26 +21,24 @@ Key Learnings:
 
 import asyncio
 import time
-import json
 import logging
+import re
 import threading
-from typing import Generator, AsyncGenerator, List, Dict, Any, Optional
+from typing import Callable, Generator, AsyncGenerator, List, Dict, Any, Optional
 from datetime import datetime
-from queue import Queue, Empty
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from functools import lru_cache
 
+import orjson
+import requests
 from subconscious import Subconscious
-from subconscious.errors import SubconsciousError
+from subconscious.errors import SubconsciousError, raise_for_status
 
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
-# Thread pool for running sync SDK operations
-_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="subconscious-")
-
-
 # Available engines
 AVAILABLE_ENGINES = [
     {"id": "tim-small-preview", "name": "TIM Small Preview", "description": "Fast, lightweight engine"},
@@ -60,90 +60,119 @@ VALID_TOOL_IDS = {t["id"] for t in AVAILABLE_TOOLS}
 
 # Sentinel value to signal end of stream
 _STREAM_END = object()
-_STREAM_ERROR = object()
-
 
-class SubconsciousService:
-    """Service for interacting with Subconscious API with proper async support."""
+# Activity content types - shared constants, so every event carries the same
+# (compile-time interned) string object
+_CT_DELTA = "delta"
+_CT_TOOL = "tool"
+_CT_INFO = "info"
+_CT_PROGRESS = "progress"
+
+# Retry classification: API statuses and exception-text markers worth another
+# attempt, and the markers of a result-polling timeout
+_RETRYABLE_STATUSES = frozenset((429, 502, 503))
+_RETRYABLE_ERROR_TOKENS = ("timeout", "connection", "terminated")
+_TIMEOUT_ERROR_TOKENS = ("timeout", "max_attempts")
+# Terminal run statuses that carry no usable result
+_FAILED_RUN_STATUSES = frozenset(("failed", "canceled", "timed_out"))
+_TERMINAL_RUN_STATUSES = _FAILED_RUN_STATUSES | {"succeeded"}
+
+# Result polling once a stream is done: every 500ms, giving up after 60s
+_FINALIZE_POLL_INTERVAL = 0.5
+_FINALIZE_MAX_POLLS = 120
+
+# Events a stream may have queued for its client before the SDK thread waits
+_MAX_UNREAD_EVENTS = 256
+
+# Raw text deltas are batched into one activity entry per this many chars,
+# or per window (seconds) during a burst
+_DELTA_BATCH_CHARS = 512
+_DELTA_BATCH_WINDOW = 0.05
+
+# Keys that mark a delta payload as a tool call
+_TOOL_KEYS = frozenset(('tool', 'tool_name', 'tooluse'))
+
+# Salvage patterns for truncated JSON answers: a string field's value,
+# allowing escaped quotes inside it
+_JSON_STRING_FIELD = r'"{}"\s*:\s*"([^"]*(?:\\.[^"]*)*)"'
+_CONCLUSION_RE = re.compile(_JSON_STRING_FIELD.format("conclusion"))
+_ANSWER_FIELD_RES = tuple(
+    re.compile(_JSON_STRING_FIELD.format(field))
+    for field in ("final_answer", "answer", "summary", "content", "response")
+)
+
+# Task titles that mark a summary-style step, boosted when picking a conclusion
+_FINAL_MARKER_RE = re.compile(r'final|summary|synthesis|conclusion|report', re.IGNORECASE)
+
+
+def _unescape_json_fragment(value: str) -> str:
+    """Undo the common JSON string escapes in a regex-salvaged fragment."""
+    # Three str.replace passes beat a single re.sub with a callback here
+    return value.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
+
+
+def _ensure_string(value: Any) -> str:
+    """Ensure value is converted to a complete string."""
+    if value is None:
+        return ""
+    if value.__class__ is str:
+        return value
+    try:
+        return str(value)
+    except Exception:
+        return repr(value)
+
+
+def _looks_like_json_object(value: str) -> bool:
+    """Whether value starts with '{' after any whitespace - without strip()'s copy."""
+    for ch in value:
+        if not ch.isspace():
+            return ch == '{'
+    return False
+
+
+_DEFAULT_TOOL_IDS = ("web_search", "webpage_understanding", "exa_search")
+
+
+@lru_cache(maxsize=32)
+def _build_tools(tool_ids: tuple, include_arxiv: bool, arxiv_url: Optional[str]) -> tuple:
+    """
+    Build the tool configuration for a selection of tool IDs.
     
-    def __init__(self, engine: Optional[str] = None):
-        settings = get_settings()
-        self.client = Subconscious(api_key=settings.SUBCONSCIOUS_API_KEY)
-        self.engine = engine or settings.SUBCONSCIOUS_ENGINE
-        self.arxiv_url = settings.ARXIV_SERVICE_URL
-        self.max_retries = settings.MAX_RETRIES
-        self.retry_delay = settings.RETRY_DELAY
-        
-        logger.info(f"SubconsciousService initialized - Engine: {self.engine}")
+    The dicts are shared between requests - treat them as read-only.
+    """
+    tools = [{"type": "platform", "id": tool_id} for tool_id in tool_ids]
     
-    def cancel_run(self, run_id: str) -> bool:
-        """
-        Cancel a run that's still in progress.
-        
-        Args:
-            run_id: The ID of the run to cancel
-            
-        Returns:
-            True if cancellation was successful
-        """
-        try:
-            logger.info(f"[CANCEL] Cancelling run: {run_id}")
-            self.client.cancel(run_id)
-            logger.info(f"[CANCEL] Successfully cancelled run: {run_id}")
-            return True
-        except SubconsciousError as e:
-            logger.error(f"[CANCEL] Failed to cancel run {run_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"[CANCEL] Unexpected error cancelling run {run_id}: {e}")
-            raise
-    
-    def _get_tools(self, tool_ids: Optional[List[str]] = None, include_arxiv: bool = True) -> List[Dict[str, Any]]:
-        """Build tool configuration based on selected tool IDs."""
-        # Default to all tools if none specified
-        if tool_ids is None:
-            tool_ids = ["web_search", "webpage_understanding", "exa_search"]
-        
-        tools = []
-        for tool_id in tool_ids:
-            tools.append({"type": "platform", "id": tool_id})
-        
-        if include_arxiv and self.arxiv_url:
-            tools.append({
-                "type": "function",
-                "name": "arxiv_search",
-                "description": "Search ArXiv for academic papers and research articles. Use this for finding peer-reviewed scientific publications, preprints, and academic research.",
-                "url": f"{self.arxiv_url}/search",
-                "method": "POST",
-                "timeout": 30,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query for academic papers"},
-                        "max_results": {"type": "integer", "default": 10}
-                    },
-                    "required": ["query"]
-                }
-            })
-        
-        return tools
+    if include_arxiv:
+        tools.append({
+            "type": "function",
+            "name": "arxiv_search",
+            "description": "Search ArXiv for academic papers and research articles. Use this for finding peer-reviewed scientific publications, preprints, and academic research.",
+            "url": f"{arxiv_url}/search",
+            "method": "POST",
+            "timeout": 30,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Search query for academic papers"},
+                    "max_results": {"type": "integer", "default": 10}
+                },
+                "required": ["query"]
+            }
+        })
     
-    def _build_instructions(self, topic: str) -> str:
-        """
-        Build a robust, comprehensive instruction prompt for the research agent.
-        
-        The prompt is designed to:
-        1. Clearly define the agent's role and capabilities
-        2. Establish a systematic research methodology
-        3. Handle diverse query types (simple facts → complex analysis)
-        4. Ensure quality, accuracy, and proper source attribution
-        5. Guard against unsafe/inappropriate requests
-        """
-        return f"""## IDENTITY & ROLE
+    return tuple(tools)
+
+
+# Research agent prompt, split around the topic so each request is a single
+# concatenation instead of re-formatting the whole template
+_INSTRUCTIONS_PREFIX = """## IDENTITY & ROLE
 You are an advanced research assistant powered by multiple information retrieval tools including web search, academic databases (ArXiv), and webpage analysis. Your purpose is to conduct thorough, accurate research and synthesize findings into clear, actionable insights.
 
 ## RESEARCH TOPIC
-{topic}
+"""
+
+_INSTRUCTIONS_SUFFIX = """
 
 ---
 
@@ -288,19 +317,210 @@ Note any gaps in available information or areas that warrant deeper investigatio
 
 Begin your research now. Be thorough, be accurate, and be helpful."""
 
-    def _ensure_string(self, value: Any) -> str:
-        """Ensure value is converted to a complete string."""
-        if value is None:
-            return ""
-        if isinstance(value, str):
-            return value
+
+def _is_progress_tick(event: Any) -> bool:
+    """True for activity events that only carry counters (no log content)."""
+    return (
+        isinstance(event, dict)
+        and event.get("type") == "activity"
+        and not event.get("content")
+    )
+
+
+class _LoopQueue:
+    """
+    Thread-side put() that hands items to an asyncio.Queue in batches.
+    
+    Lets _run_attempt push events from the SDK thread without the
+    consumer having to poll a queue.Queue from the event loop. At most one
+    loop wakeup is outstanding at a time: events that arrive before it runs
+    ride along in the same batch, so bursts of deltas cost one wakeup
+    instead of one each, and a lone event is never held back.
+    
+    With a maxsize, a put() from another thread blocks while that many items
+    are still unread, so a slow client slows the SDK read instead of piling
+    events up in memory. Puts from the loop itself never block, and once the
+    consumer closes the queue, puts are dropped.
+    """
+    
+    __slots__ = (
+        "_loop", "_queue", "_lock", "_not_full", "_pending", "_scheduled",
+        "_maxsize", "_unread", "_closed", "_loop_thread",
+    )
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, maxsize: int = 0):
+        self._loop = loop
+        self._queue = queue
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._pending: List[Any] = []
+        self._scheduled = False
+        self._maxsize = maxsize
+        self._unread = 0
+        self._closed = False
+        # Created on the loop, so this is the loop's thread
+        self._loop_thread = threading.get_ident()
+    
+    def put(self, item: Any) -> None:
+        # The bare lock (shared with the condition) skips Condition's
+        # Python-level __enter__ on this per-event path
+        with self._lock:
+            if (
+                self._maxsize
+                and self._unread >= self._maxsize
+                and threading.get_ident() != self._loop_thread
+            ):
+                while self._unread >= self._maxsize and not self._closed:
+                    # Timed, so a thread is not stranded if the loop goes away
+                    if not self._not_full.wait(1.0) and self._loop.is_closed():
+                        return
+            if self._closed:
+                return
+            self._unread += 1
+            self._pending.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            # Loop already closed (server shutting down) - nobody is listening
+            pass
+    
+    def _flush(self) -> None:
+        """Move everything queued so far onto the asyncio.Queue (runs on the loop)."""
+        with self._lock:
+            items, self._pending = self._pending, []
+            self._scheduled = False
+        for item in items:
+            self._queue.put_nowait(item)
+    
+    def _taken(self) -> None:
+        if self._maxsize:
+            with self._lock:
+                self._unread -= 1
+                # Only the read that frees the first slot can unblock the producer
+                if self._unread == self._maxsize - 1:
+                    self._not_full.notify()
+    
+    async def get(self) -> Any:
+        item = await self._queue.get()
+        self._taken()
+        return item
+    
+    def get_nowait(self) -> Any:
+        item = self._queue.get_nowait()
+        self._taken()
+        return item
+    
+    def empty(self) -> bool:
+        return self._queue.empty()
+    
+    def close(self) -> None:
+        """Stop accepting items and release any producer blocked on a full queue."""
+        with self._not_full:
+            self._closed = True
+            self._not_full.notify_all()
+
+
+class _PooledSubconscious(Subconscious):
+    """
+    Subconscious client whose JSON calls reuse keep-alive connections.
+    
+    The SDK issues get/wait/cancel through module-level requests.request(),
+    so every call - each wait() poll included - opens a new TCP+TLS
+    connection. This routes them through a requests.Session per worker
+    thread (Sessions are not thread-safe), kept warm across streams.
+    stream() still connects per call; the SDK gives it no session hook.
+    """
+    
+    _sessions = threading.local()
+    
+    def _request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+        response = session.request(
+            method=method,
+            url=f"{self._base_url}{path}",
+            headers=self._headers(),
+            json=json_data,
+        )
+        raise_for_status(response)
+        return response.json()
+
+
+class _EventBuffer(deque):
+    """put()-able deque for a stream that is filled and drained on one thread."""
+    
+    __slots__ = ()
+    
+    put = deque.append
+
+
+class SubconsciousService:
+    """Service for interacting with Subconscious API with proper async support."""
+    
+    def __init__(self, engine: Optional[str] = None):
+        settings = get_settings()
+        self.client = _PooledSubconscious(api_key=settings.SUBCONSCIOUS_API_KEY)
+        self.engine = engine or settings.SUBCONSCIOUS_ENGINE
+        self.arxiv_url = settings.ARXIV_SERVICE_URL
+        self.max_retries = settings.MAX_RETRIES
+        self.retry_delay = settings.RETRY_DELAY
+        
+        logger.info(f"SubconsciousService initialized - Engine: {self.engine}")
+    
+    def cancel_run(self, run_id: str) -> bool:
+        """
+        Cancel a run that's still in progress.
+        
+        Args:
+            run_id: The ID of the run to cancel
+            
+        Returns:
+            True if cancellation was successful
+        """
         try:
-            return str(value)
-        except:
-            return repr(value)
+            logger.info(f"[CANCEL] Cancelling run: {run_id}")
+            self.client.cancel(run_id)
+            logger.info(f"[CANCEL] Successfully cancelled run: {run_id}")
+            return True
+        except SubconsciousError as e:
+            logger.error(f"[CANCEL] Failed to cancel run {run_id}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"[CANCEL] Unexpected error cancelling run {run_id}: {e}")
+            raise
+    
+    def _get_tools(self, tool_ids: Optional[List[str]] = None, include_arxiv: bool = True) -> List[Dict[str, Any]]:
+        """Build tool configuration based on selected tool IDs (cached per selection)."""
+        # Default to all tools if none specified
+        key = _DEFAULT_TOOL_IDS if tool_ids is None else tuple(tool_ids)
+        return list(_build_tools(key, bool(include_arxiv and self.arxiv_url), self.arxiv_url))
+    
+    def _build_instructions(self, topic: str) -> str:
+        """
+        Build a robust, comprehensive instruction prompt for the research agent.
+        
+        The prompt is designed to:
+        1. Clearly define the agent's role and capabilities
+        2. Establish a systematic research methodology
+        3. Handle diverse query types (simple facts → complex analysis)
+        4. Ensure quality, accuracy, and proper source attribution
+        5. Guard against unsafe/inappropriate requests
+        
+        The template text lives in _INSTRUCTIONS_PREFIX/_INSTRUCTIONS_SUFFIX.
+        """
+        return _INSTRUCTIONS_PREFIX + topic + _INSTRUCTIONS_SUFFIX
 
     def _serialize_reasoning(self, reasoning: Any) -> List[Dict[str, Any]]:
-        """Serialize reasoning to JSON-serializable format without truncation."""
+        """Serialize reasoning to JSON-serializable format without truncation - a list of dicts, subtasks included."""
         if not reasoning:
             return []
         
@@ -310,7 +530,7 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         if hasattr(reasoning, '__dict__') or isinstance(reasoning, dict):
             return [self._serialize_task(reasoning)]
         
-        return [{"content": self._ensure_string(reasoning)}]
+        return [{"content": _ensure_string(reasoning)}]
     
     def _serialize_task(self, task: Any) -> Dict[str, Any]:
         """Serialize a single task recursively without truncation."""
@@ -319,10 +539,12 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         if isinstance(task, dict):
             for key in ['title', 'thought', 'conclusion', 'content']:
                 if key in task and task[key] is not None:
-                    result[key] = self._ensure_string(task[key])
+                    result[key] = _ensure_string(task[key])
             
-            if task.get('tooluse'):
-                result['tooluse'] = self._serialize_tooluse(task['tooluse'])
+            tooluse = task.get('tooluse')
+            if tooluse:
+                # Dict tooluse is already the wire shape - skip the call
+                result['tooluse'] = tooluse if isinstance(tooluse, dict) else self._serialize_tooluse(tooluse)
             
             if task.get('subtasks'):
                 result['subtasks'] = [self._serialize_task(st) for st in task['subtasks']]
@@ -331,7 +553,7 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
                 if hasattr(task, attr):
                     value = getattr(task, attr)
                     if value is not None:
-                        result[attr] = self._ensure_string(value)
+                        result[attr] = _ensure_string(value)
             
             if hasattr(task, 'tooluse') and task.tooluse:
                 tooluse = task.tooluse
@@ -352,78 +574,60 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         if isinstance(tooluse, dict):
             return tooluse
         return {
-            'tool_name': self._ensure_string(getattr(tooluse, 'tool_name', tooluse)),
+            'tool_name': _ensure_string(getattr(tooluse, 'tool_name', tooluse)),
             'parameters': getattr(tooluse, 'parameters', None),
             'tool_result': getattr(tooluse, 'tool_result', None),
         }
 
-    def _collect_all_conclusions(self, tasks: List[Dict[str, Any]], depth: int = 0) -> List[str]:
-        """Recursively collect all conclusions from reasoning tree."""
+    def _scan_conclusions(self, tasks: List[Dict[str, Any]]) -> tuple:
+        """
+        Walk the reasoning tree once, iteratively, for answer synthesis.
+        Expects _serialize_reasoning output, where every node is a dict.
+        
+        Returns (conclusions, best_conclusion): every substantial conclusion in
+        tree order, and the highest-scoring one - longest, boosted for
+        summary-like titles and top-level steps; the first wins on ties.
+        """
         conclusions = []
+        best_conclusion, best_score = None, 0
+        stack = [(task, 0) for task in reversed(tasks)]
         
-        for task in tasks:
-            if isinstance(task, dict):
-                conclusion = task.get('conclusion', '')
-                if conclusion and len(conclusion.strip()) > 20:
+        while stack:
+            task, depth = stack.pop()
+            
+            conclusion = task.get('conclusion', '')
+            if conclusion:
+                if len(conclusion.strip()) > 20:
                     conclusions.append(conclusion)
                 
-                if task.get('subtasks'):
-                    conclusions.extend(self._collect_all_conclusions(task['subtasks'], depth + 1))
+                score = len(conclusion)
+                if _FINAL_MARKER_RE.search(task.get('title', '')):
+                    score *= 3
+                if depth == 0:
+                    score *= 1.5
+                if score > best_score:
+                    best_conclusion, best_score = conclusion, score
+            
+            if task.get('subtasks'):
+                # Reversed so children pop in order, keeping a pre-order walk
+                stack.extend((st, depth + 1) for st in reversed(task['subtasks']))
         
-        return conclusions
+        return conclusions, best_conclusion
 
     def _synthesize_answer_from_reasoning(self, reasoning: List[Dict[str, Any]]) -> str:
         """Build a coherent answer from reasoning conclusions when no explicit answer exists."""
-        conclusions = self._collect_all_conclusions(reasoning)
+        conclusions, best_conclusion = self._scan_conclusions(reasoning)
         
         if not conclusions:
             return "No analysis results available."
         
-        def score_task(task: Dict[str, Any], depth: int = 0) -> tuple:
-            """Score a task based on its conclusion quality."""
-            conclusion = task.get('conclusion', '')
-            title = task.get('title', '').lower()
-            
-            if not conclusion:
-                return (None, 0)
-            
-            score = len(conclusion)
-            
-            if any(marker in title for marker in ['final', 'summary', 'synthesis', 'conclusion', 'report']):
-                score *= 3
-            
-            if depth == 0:
-                score *= 1.5
-            
-            return (conclusion, score)
-        
-        def find_best_in_tree(tasks: List[Dict[str, Any]], depth: int = 0) -> tuple:
-            """Find the best conclusion in the tree."""
-            best = (None, 0)
-            
-            for task in tasks:
-                if isinstance(task, dict):
-                    conclusion, score = score_task(task, depth)
-                    if score > best[1]:
-                        best = (conclusion, score)
-                    
-                    if task.get('subtasks'):
-                        sub_best = find_best_in_tree(task['subtasks'], depth + 1)
-                        if sub_best[1] > best[1]:
-                            best = sub_best
-            
-            return best
-        
-        best_conclusion, _ = find_best_in_tree(reasoning)
-        
         if best_conclusion and len(best_conclusion) > 200:
             return best_conclusion
         
         substantial = [c for c in conclusions if len(c) > 100]
         
         if substantial:
-            substantial.sort(key=len, reverse=True)
-            return substantial[0]
+            return max(substantial, key=len)
         
         if conclusions:
             return "\n\n".join(conclusions[:5])
@@ -445,9 +649,9 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         original_answer = answer  # Keep original for fallback
         
         # First, check if answer is JSON with embedded data
-        if isinstance(answer, str) and answer.strip().startswith('{'):
+        if isinstance(answer, str) and _looks_like_json_object(answer):
             try:
-                parsed = json.loads(answer)
+                parsed = orjson.loads(answer)
                 if isinstance(parsed, dict):
                     logger.info(f"[EXTRACT] Parsed JSON answer, keys: {list(parsed.keys())}")
                     
@@ -470,7 +674,7 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
                         logger.info(f"[EXTRACT] No explicit answer field, will synthesize from reasoning")
                         answer = None
                         
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 # JSON is malformed/truncated - attempt to salvage
                 logger.warning(f"[EXTRACT] JSON parse failed at position {e.pos}: {e.msg}")
                 logger.info(f"[EXTRACT] Attempting to salvage content from malformed JSON...")
@@ -496,20 +700,9 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         # Check if answer needs synthesis
         needs_synthesis = (
             answer is None or 
-            (isinstance(answer, str) and len(answer.strip()) == 0)
+            (isinstance(answer, str) and (not answer or answer.isspace()))
         )
         
-        # Don't synthesize if we have substantial content (even if it looks like JSON)
-        if isinstance(answer, str) and answer.strip().startswith('{') and len(answer) > 1000:
-            # We have a large JSON-like string - try to make it readable
-            needs_synthesis = False
-            if processed_reasoning:
-                # Prefer synthesized answer from reasoning over raw JSON blob
-                logger.info(f"[EXTRACT] Have JSON blob and reasoning - synthesizing from reasoning")
-                synthesized = self._synthesize_answer_from_reasoning(processed_reasoning)
-                if len(synthesized) > 100:
-                    answer = synthesized
-        
         if needs_synthesis:
             if processed_reasoning:
                 logger.info(f"[EXTRACT] Synthesizing answer from reasoning tree")
@@ -517,8 +710,20 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
                 logger.info(f"[EXTRACT] Synthesized answer: {len(answer)} chars")
             else:
                 answer = "Research completed but no results available."
+        elif (
+            processed_reasoning
+            and isinstance(answer, str)
+            and len(answer) > 1000
+            and _looks_like_json_object(answer)
+        ):
+            # Substantial content, but a raw JSON blob - prefer an answer
+            # synthesized from reasoning when that has some substance
+            logger.info(f"[EXTRACT] Have JSON blob and reasoning - synthesizing from reasoning")
+            synthesized = self._synthesize_answer_from_reasoning(processed_reasoning)
+            if len(synthesized) > 100:
+                answer = synthesized
         
-        answer = self._ensure_string(answer)
+        answer = _ensure_string(answer)
         
         return answer, processed_reasoning
 
@@ -529,32 +734,24 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         """
         try:
             # Look for common patterns in the JSON that contain readable text
-            import re
-            
             salvaged_parts = []
             
             # Extract conclusion fields
-            conclusions = re.findall(r'"conclusion"\s*:\s*"([^"]*(?:\\.[^"]*)*)"', content)
-            if conclusions:
-                for c in conclusions:
-                    # Unescape JSON strings
-                    unescaped = c.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
-                    if len(unescaped) > 50:
-                        salvaged_parts.append(unescaped)
+            for c in _CONCLUSION_RE.findall(content):
+                unescaped = _unescape_json_fragment(c)
+                if len(unescaped) > 50:
+                    salvaged_parts.append(unescaped)
             
             # Extract answer/summary fields
-            for field in ['final_answer', 'answer', 'summary', 'content', 'response']:
-                pattern = rf'"{field}"\s*:\s*"([^"]*(?:\\.[^"]*)*)"'
-                matches = re.findall(pattern, content)
-                for m in matches:
-                    unescaped = m.replace('\\"', '"').replace('\\n', '\n').replace('\\t', '\t')
+            for pattern in _ANSWER_FIELD_RES:
+                for m in pattern.findall(content):
+                    unescaped = _unescape_json_fragment(m)
                     if len(unescaped) > 100:
                         salvaged_parts.append(unescaped)
             
             if salvaged_parts:
                 # Return the longest salvaged content
-                salvaged_parts.sort(key=len, reverse=True)
-                return salvaged_parts[0]
+                return max(salvaged_parts, key=len)
             
             return None
             
@@ -568,7 +765,7 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         Returns (content, content_type) tuple.
         """
         delta_content = None
-        content_type = "delta"
+        content_type = _CT_DELTA
         
         try:
             # Try to get content from delta event
@@ -582,13 +779,14 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
             # Parse JSON content if present
             if delta_content and isinstance(delta_content, str):
                 try:
-                    parsed = json.loads(delta_content)
+                    parsed = orjson.loads(delta_content)
                     if isinstance(parsed, dict):
                         # Look for tool calls
-                        if 'tool' in parsed or 'tool_name' in parsed or 'tooluse' in parsed:
+                        if not _TOOL_KEYS.isdisjoint(parsed):
                             tool_name = parsed.get('tool') or parsed.get('tool_name') or 'tool'
-                            if isinstance(parsed.get('tooluse'), dict):
-                                tool_name = parsed['tooluse'].get('tool_name', tool_name)
+                            tooluse = parsed.get('tooluse')
+                            if isinstance(tooluse, dict):
+                                tool_name = tooluse.get('tool_name', tool_name)
                             params = parsed.get('parameters') or parsed.get('tooluse', {}).get('parameters', {})
                             if params and isinstance(params, dict):
                                 query = params.get('query', '')
@@ -598,11 +796,11 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
                                     delta_content = f"Using tool: {tool_name}"
                             else:
                                 delta_content = f"Using tool: {tool_name}"
-                            content_type = "tool"
+                            content_type = _CT_TOOL
                         # Look for thoughts/reasoning
                         elif 'thought' in parsed:
                             delta_content = f"Thinking: {parsed['thought']}"
-                            content_type = "info"
+                            content_type = _CT_INFO
                         elif 'title' in parsed:
                             title = parsed['title']
                             thought = parsed.get('thought', '')
@@ -610,262 +808,420 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
                                 delta_content = f"Task: {title}\n{thought}"
                             else:
                                 delta_content = f"Task: {title}"
-                            content_type = "info"
+                            content_type = _CT_INFO
                         elif 'conclusion' in parsed:
                             delta_content = f"Conclusion: {parsed['conclusion']}"
-                            content_type = "info"
+                            content_type = _CT_INFO
                         elif 'message' in parsed:
                             delta_content = parsed['message']
-                            content_type = "info"
-                except json.JSONDecodeError:
+                            content_type = _CT_INFO
+                except orjson.JSONDecodeError:
                     pass
                     
         except Exception as e:
-            logger.debug(f"[STREAM] Could not extract delta content: {e}")
+            logger.debug("[STREAM] Could not extract delta content: %s", e)
         
         return delta_content, content_type
 
-    def _run_sync_stream(
+    def _start_stream(
         self,
-        queue: Queue,
+        queue: Any,
         topic: str,
         engine: str,
         tool_ids: Optional[List[str]],
         include_arxiv: bool
-    ) -> None:
+    ) -> Dict[str, Any]:
+        """Build the SDK input for a stream and announce it. Returns the input config."""
+        tools = self._get_tools(tool_ids, include_arxiv)
+        tool_names = [t.get('id') or t.get('name') for t in tools]
+        
+        input_config = {
+            "instructions": self._build_instructions(topic),
+            "tools": tools,
+        }
+        
+        # Initial status
+        queue.put({
+            "type": "status",
+            "phase": "init",
+            "message": "Initializing research agent...",
+            "details": {"engine": engine, "tools": tool_names}
+        })
+        
+        return input_config
+
+    def _retry_delay(self, queue: Any, attempt: int) -> float:
+        """Announce a retry and return the backoff to wait before it."""
+        delay = self.retry_delay * (2 ** (attempt - 2))
+        queue.put({
+            "type": "status",
+            "phase": "retry",
+            "message": f"Retrying in {delay:.0f}s... (attempt {attempt}/{self.max_retries})",
+        })
+        logger.info("[STREAM] Sleeping %ss...", delay)
+        return delay
+
+    def _report_retries_exhausted(self, queue: Any, last_error: Optional[str]) -> None:
+        """Send the final error once no attempts are left."""
+        logger.error("[STREAM] Max retries exhausted. Last error: %s", last_error)
+        queue.put({"type": "error", "error": f"Failed after {self.max_retries} attempts: {last_error}"})
+
+    def _text_activity(self, fragments: List[str], delta_count: int, elapsed: float) -> Dict[str, Any]:
+        """Build one activity entry from a batch of raw text deltas."""
+        return {
+            "type": "activity",
+            "delta_count": delta_count,
+            "elapsed": round(elapsed, 1),
+            "content": "".join(fragments),
+            "content_type": _CT_DELTA,
+        }
+
+    def _flush_text(self, queue: Any, fragments: List[str], delta_count: int, stream_start: float) -> None:
+        """Send any still-buffered text deltas before the stream's final event."""
+        if fragments:
+            queue.put(self._text_activity(fragments, delta_count, time.monotonic() - stream_start))
+
+    def _wait_for_run(self, run_id: str, stop: Optional[threading.Event]) -> Optional[Any]:
         """
-        Run the synchronous SDK stream in a background thread.
-        Pushes events to the queue for async consumption.
+        Poll a run until it is terminal, like client.wait(), but stoppable.
+        
+        The first GET goes out straight away - usually enough, as the stream
+        is done. Between polls the thread waits on stop rather than sleeping,
+        so a consumer leaving mid-finalize frees it within one interval.
+        Returns None once stop is set.
+        
+        Raises:
+            TimeoutError: If the run is still not terminal after the last poll
         """
+        for poll in range(1, _FINALIZE_MAX_POLLS + 1):
+            if stop is not None and stop.is_set():
+                return None
+            run = self.client.get(run_id)
+            if run.status in _TERMINAL_RUN_STATUSES:
+                return run
+            if poll < _FINALIZE_MAX_POLLS:
+                if stop is None:
+                    time.sleep(_FINALIZE_POLL_INTERVAL)
+                elif stop.wait(_FINALIZE_POLL_INTERVAL):
+                    return None
+        raise TimeoutError(f"Polling exceeded max attempts ({_FINALIZE_MAX_POLLS})")
+
+    def _run_attempt(
+        self,
+        queue: Any,
+        engine: str,
+        input_config: Dict[str, Any],
+        attempt: int,
+        stop: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """
+        Run one blocking SDK stream attempt, pushing its events to the queue.
+        
+        Returns the error to retry on, or None once the stream has finished
+        (its done or error event already sent) or stop was set - checked per
+        event and between result polls, so an abandoned stream stops reading.
+        Never sleeps between attempts - backoff is the caller's job, so a
+        pooled thread is not held while waiting.
+        """
+        # Raw text deltas waiting to go out as one activity entry, and the
+        # delta_count of the last one - set before the try so every exit flushes
+        pending_text: List[str] = []
+        pending_count = 0
         try:
-            tools = self._get_tools(tool_ids, include_arxiv)
-            tool_names = [t.get('id') or t.get('name') for t in tools]
+            queue.put({"type": "status", "phase": "connecting", "message": "Connecting to API..."})
             
-            input_config = {
-                "instructions": self._build_instructions(topic),
-                "tools": tools,
-            }
+            logger.info("[STREAM] Calling client.stream()...")
+            stream_start = time.monotonic()
             
-            # Initial status
-            queue.put({
-                "type": "status",
-                "phase": "init",
-                "message": "Initializing research agent...",
-                "details": {"engine": engine, "tools": tool_names}
-            })
+            stream = self.client.stream(engine=engine, input=input_config)
             
-            attempt = 0
-            last_error = None
+            queue.put({"type": "status", "phase": "researching", "message": "Research in progress..."})
+            
+            run_id = None
+            delta_count = 0
+            last_progress_time = time.monotonic()
+            pending_chars = 0
+            log_info = logger.isEnabledFor(logging.INFO)
+            # Bound once - the delta branch below runs per token
+            put = queue.put
             
-            while attempt < self.max_retries:
-                attempt += 1
-                logger.info(f"[STREAM] --- ATTEMPT {attempt}/{self.max_retries} ---")
+            logger.info("[STREAM] Iterating events...")
+            
+            for event in stream:
+                if stop is not None and stop.is_set():
+                    # Consumer is gone - drop the connection and skip the result fetch
+                    logger.info("[STREAM] Stopped: consumer went away after %s deltas", delta_count)
+                    stream.close()
+                    return None
                 
-                try:
-                    if attempt > 1:
-                        delay = self.retry_delay * (2 ** (attempt - 2))
-                        queue.put({
-                            "type": "status",
-                            "phase": "retry",
-                            "message": f"Retrying in {delay:.0f}s... (attempt {attempt}/{self.max_retries})",
-                        })
-                        logger.info(f"[STREAM] Sleeping {delay}s...")
-                        time.sleep(delay)
+                event_type = event.type
+                
+                if event_type == "delta":
+                    delta_count += 1
+                    # One clock read per delta, shared by logging and throttling
+                    now = time.monotonic()
+                    
+                    # Extract run_id from first delta event and send immediately
+                    # This allows frontend to cancel the run at any time
+                    if delta_count == 1:
+                        event_run_id = getattr(event, 'run_id', None)
+                        if event_run_id:
+                            run_id = event_run_id
+                            if log_info:
+                                logger.info("[STREAM] First delta at %.1fs - run_id=%s", now - stream_start, run_id)
+                            # Send run_started event so frontend can track run_id for cancellation
+                            put({
+                                "type": "run_started",
+                                "run_id": run_id,
+                                "message": "Research started - you can cancel at any time",
+                            })
+                        elif log_info:
+                            logger.info("[STREAM] First delta at %.1fs - no run_id yet", now - stream_start)
+                    
+                    if log_info and delta_count % 50 == 0:
+                        logger.info("[STREAM] Delta #%d at %.1fs", delta_count, now - stream_start)
                     
-                    queue.put({"type": "status", "phase": "connecting", "message": "Connecting to API..."})
+                    # Extract content from delta for activity log
+                    delta_content, content_type = self._extract_delta_content(event)
                     
-                    logger.info(f"[STREAM] Calling client.stream()...")
-                    stream_start = time.time()
+                    has_content = False
+                    if delta_content:
+                        text = str(delta_content)
+                        if content_type is _CT_DELTA:
+                            # Every raw text fragment is buffered, token-sized ones
+                            # included - the batch is joined, so skipping one would
+                            # run its neighbours together
+                            pending_text.append(text)
+                            pending_chars += len(text)
+                            pending_count = delta_count
+                            delta_content = None
+                        else:
+                            # Standalone tool/info entries need meaningful content;
+                            # token-sized fragments fail the raw length test,
+                            # skipping the strip() copy
+                            has_content = len(text) > 5 and len(text.strip()) > 5
                     
-                    stream = self.client.stream(engine=engine, input=input_config)
+                    # Flush buffered text once it is large or old, or ahead of a
+                    # tool/info entry so the log keeps its order. Text after a
+                    # quiet spell goes out at once; only bursts are batched.
+                    if pending_text and (
+                        has_content
+                        or pending_chars >= _DELTA_BATCH_CHARS
+                        or (pending_chars > 5 and now - last_progress_time >= _DELTA_BATCH_WINDOW)
+                    ):
+                        put(self._text_activity(pending_text, pending_count, now - stream_start))
+                        pending_text = []
+                        pending_chars = 0
+                        last_progress_time = now
                     
-                    queue.put({"type": "status", "phase": "researching", "message": "Research in progress..."})
+                    if has_content or now - last_progress_time > 1.5:
+                        put({
+                            "type": "activity",
+                            "delta_count": delta_count,
+                            "elapsed": round(now - stream_start, 1),
+                            "content": delta_content if delta_content else None,
+                            "content_type": content_type if has_content else _CT_PROGRESS,
+                        })
+                        last_progress_time = now
+                
+                elif event_type == "done":
+                    run_id = event.run_id
+                    total_time = time.monotonic() - stream_start
+                    
+                    if pending_text:
+                        queue.put(self._text_activity(pending_text, pending_count, total_time))
                     
-                    run_id = None
-                    delta_count = 0
-                    last_progress_time = time.time()
+                    logger.info("[STREAM] DONE! run_id=%s, deltas=%s, time=%.1fs", run_id, delta_count, total_time)
                     
-                    logger.info(f"[STREAM] Iterating events...")
+                    queue.put({"type": "status", "phase": "finalizing", "message": "Fetching results..."})
                     
-                    for event in stream:
-                        elapsed = time.time() - stream_start
+                    try:
+                        logger.info("[STREAM] Waiting for run completion of %s...", run_id)
                         
-                        if event.type == "delta":
-                            delta_count += 1
-                            
-                            # Extract run_id from first delta event and send immediately
-                            # This allows frontend to cancel the run at any time
-                            if delta_count == 1:
-                                event_run_id = getattr(event, 'run_id', None)
-                                if event_run_id:
-                                    run_id = event_run_id
-                                    logger.info(f"[STREAM] First delta at {elapsed:.1f}s - run_id={run_id}")
-                                    # Send run_started event so frontend can track run_id for cancellation
-                                    queue.put({
-                                        "type": "run_started",
-                                        "run_id": run_id,
-                                        "message": "Research started - you can cancel at any time",
-                                    })
-                                else:
-                                    logger.info(f"[STREAM] First delta at {elapsed:.1f}s - no run_id yet")
-                            
-                            if delta_count % 50 == 0:
-                                logger.info(f"[STREAM] Delta #{delta_count} at {elapsed:.1f}s")
-                            
-                            # Extract content from delta for activity log
-                            delta_content, content_type = self._extract_delta_content(event)
-                            
-                            # Send activity log entry when we have meaningful content
-                            has_content = delta_content and len(str(delta_content).strip()) > 5
-                            time_elapsed = time.time() - last_progress_time > 1.5
-                            
-                            if has_content or time_elapsed:
-                                queue.put({
-                                    "type": "activity",
-                                    "delta_count": delta_count,
-                                    "elapsed": round(elapsed, 1),
-                                    "content": delta_content if delta_content else None,
-                                    "content_type": content_type if has_content else "progress",
-                                })
-                                last_progress_time = time.time()
+                        run_result = self._wait_for_run(run_id, stop)
+                        if run_result is None:
+                            logger.info("[STREAM] Stopped: consumer went away while finalizing %s", run_id)
+                            return None
+                        
+                        logger.info("[STREAM] Run completed with status: %s", run_result.status)
                         
-                        elif event.type == "done":
-                            run_id = event.run_id
-                            total_time = time.time() - stream_start
+                        if run_result.status in _FAILED_RUN_STATUSES:
+                            error_detail = getattr(run_result, 'error', None)
+                            error_msg = f"Run {run_result.status}"
+                            if error_detail:
+                                error_msg += f": {error_detail}"
+                            logger.error("[STREAM] %s", error_msg)
+                            queue.put({"type": "error", "error": error_msg})
+                            return None
+                        
+                        if run_result and run_result.result:
+                            raw_answer = run_result.result.answer
+                            raw_reasoning = run_result.result.reasoning
                             
-                            logger.info(f"[STREAM] DONE! run_id={run_id}, deltas={delta_count}, time={total_time:.1f}s")
+                            logger.info("[STREAM] Raw answer type: %s", type(raw_answer).__name__)
+                            logger.info("[STREAM] Raw answer length: %s", len(raw_answer) if raw_answer else 0)
+                            logger.info("[STREAM] Raw reasoning: %s steps", len(raw_reasoning) if raw_reasoning else 0)
                             
-                            queue.put({"type": "status", "phase": "finalizing", "message": "Fetching results..."})
+                            answer, reasoning = self._extract_answer(raw_answer, raw_reasoning)
                             
-                            try:
-                                logger.info(f"[STREAM] Waiting for run completion via client.wait({run_id})...")
-                                
-                                run_result = self.client.wait(
-                                    run_id,
-                                    options={
-                                        "interval_ms": 2000,
-                                        "max_attempts": 30,
-                                    }
-                                )
-                                
-                                logger.info(f"[STREAM] Run completed with status: {run_result.status}")
-                                
-                                if run_result.status in ["failed", "canceled", "timed_out"]:
-                                    error_detail = getattr(run_result, 'error', None)
-                                    error_msg = f"Run {run_result.status}"
-                                    if error_detail:
-                                        error_msg += f": {error_detail}"
-                                    logger.error(f"[STREAM] {error_msg}")
-                                    queue.put({"type": "error", "error": error_msg})
-                                    queue.put(_STREAM_END)
-                                    return
-                                
-                                if run_result and run_result.result:
-                                    raw_answer = run_result.result.answer
-                                    raw_reasoning = run_result.result.reasoning
-                                    
-                                    logger.info(f"[STREAM] Raw answer type: {type(raw_answer).__name__}")
-                                    logger.info(f"[STREAM] Raw answer length: {len(raw_answer) if raw_answer else 0}")
-                                    logger.info(f"[STREAM] Raw reasoning: {len(raw_reasoning) if raw_reasoning else 0} steps")
-                                    
-                                    answer, reasoning = self._extract_answer(raw_answer, raw_reasoning)
-                                    
-                                    logger.info(f"[STREAM] Final answer length: {len(answer)} chars")
-                                    logger.info(f"[STREAM] Final reasoning steps: {len(reasoning)}")
-                                    
-                                    queue.put({
-                                        "type": "done",
-                                        "run_id": run_id,
-                                        "answer": answer,
-                                        "reasoning": reasoning,
-                                    })
-                                    
-                                    logger.info(f"[STREAM] SUCCESS!")
-                                    queue.put(_STREAM_END)
-                                    return
-                                else:
-                                    logger.warning(f"[STREAM] No result in run_result")
-                                    queue.put({"type": "error", "error": "No result returned from API"})
-                                    queue.put(_STREAM_END)
-                                    return
-                                    
-                            except Exception as fetch_error:
-                                error_str = str(fetch_error).lower()
-                                if 'timeout' in error_str or 'max_attempts' in error_str:
-                                    logger.error(f"[STREAM] Polling timed out: {fetch_error}")
-                                    queue.put({"type": "error", "error": "Request timed out while waiting for results. Please try again."})
-                                else:
-                                    logger.exception(f"[STREAM] Failed to fetch result: {fetch_error}")
-                                    queue.put({"type": "error", "error": f"Failed to fetch result: {str(fetch_error)}"})
-                                queue.put(_STREAM_END)
-                                return
-                        
-                        elif event.type == "error":
-                            error_msg = getattr(event, 'error', None) or getattr(event, 'message', None) or str(event)
-                            logger.error(f"[STREAM] Error event: {error_msg}")
+                            logger.info("[STREAM] Final answer length: %s chars", len(answer))
+                            logger.info("[STREAM] Final reasoning steps: %s", len(reasoning))
                             
-                            if "terminated" in error_msg.lower() and attempt < self.max_retries:
-                                logger.warning(f"[STREAM] 'terminated' error - will retry")
-                                last_error = error_msg
-                                queue.put({
-                                    "type": "status",
-                                    "phase": "retry",
-                                    "message": "Connection terminated, preparing to retry...",
-                                })
-                                break
+                            queue.put({
+                                "type": "done",
+                                "run_id": run_id,
+                                "answer": answer,
+                                "reasoning": reasoning,
+                            })
                             
-                            queue.put({"type": "error", "error": error_msg})
-                            queue.put(_STREAM_END)
-                            return
-                    else:
-                        logger.warning(f"[STREAM] Stream ended without done event")
-                        queue.put({"type": "error", "error": f"Stream ended unexpectedly ({delta_count} deltas received)"})
-                        queue.put(_STREAM_END)
-                        return
-                    
-                    continue
-                    
-                except SubconsciousError as e:
-                    error_msg = str(e)
-                    logger.error(f"[STREAM] SubconsciousError: {error_msg} (status={e.status})")
-                    last_error = error_msg
-                    
-                    if e.status in [503, 502, 429] and attempt < self.max_retries:
-                        queue.put({
-                            "type": "status",
-                            "phase": "retry",
-                            "message": f"Service unavailable ({e.code}), will retry...",
-                        })
-                        continue
-                    
-                    queue.put({"type": "error", "error": error_msg})
-                    queue.put(_STREAM_END)
-                    return
-                    
-                except Exception as e:
-                    error_msg = f"{type(e).__name__}: {str(e)}"
-                    logger.exception(f"[STREAM] Exception: {error_msg}")
-                    last_error = error_msg
+                            logger.info("[STREAM] SUCCESS!")
+                            return None
+                        else:
+                            logger.warning("[STREAM] No result in run_result")
+                            queue.put({"type": "error", "error": "No result returned from API"})
+                            return None
+                            
+                    except Exception as fetch_error:
+                        fetch_str = str(fetch_error)
+                        error_str = fetch_str.lower()
+                        if isinstance(fetch_error, TimeoutError) or any(token in error_str for token in _TIMEOUT_ERROR_TOKENS):
+                            logger.error("[STREAM] Polling timed out: %s", fetch_error)
+                            queue.put({"type": "error", "error": "Request timed out while waiting for results. Please try again."})
+                        else:
+                            logger.exception("[STREAM] Failed to fetch result: %s", fetch_error)
+                            queue.put({"type": "error", "error": f"Failed to fetch result: {fetch_str}"})
+                        return None
+                
+                elif event_type == "error":
+                    error_msg = getattr(event, 'error', None) or getattr(event, 'message', None) or str(event)
+                    logger.error("[STREAM] Error event: %s", error_msg)
+                    self._flush_text(queue, pending_text, pending_count, stream_start)
                     
-                    if any(x in str(e).lower() for x in ['timeout', 'connection', 'terminated']) and attempt < self.max_retries:
+                    if "terminated" in error_msg.lower() and attempt < self.max_retries:
+                        logger.warning("[STREAM] 'terminated' error - will retry")
                         queue.put({
                             "type": "status",
                             "phase": "retry",
-                            "message": "Connection issue, will retry...",
+                            "message": "Connection terminated, preparing to retry...",
                         })
-                        continue
+                        return error_msg
                     
                     queue.put({"type": "error", "error": error_msg})
-                    queue.put(_STREAM_END)
-                    return
+                    return None
+            
+            logger.warning("[STREAM] Stream ended without done event")
+            self._flush_text(queue, pending_text, pending_count, stream_start)
+            queue.put({"type": "error", "error": f"Stream ended unexpectedly ({delta_count} deltas received)"})
+            return None
+            
+        except SubconsciousError as e:
+            error_msg = str(e)
+            logger.error("[STREAM] SubconsciousError: %s (status=%s)", error_msg, e.status)
+            if pending_text:  # only ever non-empty once stream_start is set
+                self._flush_text(queue, pending_text, pending_count, stream_start)
+            
+            if e.status in _RETRYABLE_STATUSES and attempt < self.max_retries:
+                queue.put({
+                    "type": "status",
+                    "phase": "retry",
+                    "message": f"Service unavailable ({e.code}), will retry...",
+                })
+                return error_msg
             
-            logger.error(f"[STREAM] Max retries exhausted. Last error: {last_error}")
-            queue.put({"type": "error", "error": f"Failed after {self.max_retries} attempts: {last_error}"})
+            queue.put({"type": "error", "error": error_msg})
+            return None
+            
+        except Exception as e:
+            err_str = str(e)
+            error_msg = f"{type(e).__name__}: {err_str}"
+            logger.exception("[STREAM] Exception: %s", error_msg)
+            if pending_text:
+                self._flush_text(queue, pending_text, pending_count, stream_start)
+            
+            if attempt < self.max_retries and any(token in err_str.lower() for token in _RETRYABLE_ERROR_TOKENS):
+                queue.put({
+                    "type": "status",
+                    "phase": "retry",
+                    "message": "Connection issue, will retry...",
+                })
+                return error_msg
+            
+            queue.put({"type": "error", "error": error_msg})
+            return None
+    
+
+    def _run_sync_stream(
+        self,
+        queue: Any,
+        topic: str,
+        engine: str,
+        tool_ids: Optional[List[str]],
+        include_arxiv: bool
+    ) -> None:
+        """
+        Run the whole stream, retries included, in the calling thread.
+        Used by the deprecated stream(); stream_async() drives the same
+        attempts from the event loop instead.
+        """
+        try:
+            input_config = self._start_stream(queue, topic, engine, tool_ids, include_arxiv)
+            last_error = None
+            
+            for attempt in range(1, self.max_retries + 1):
+                logger.info("[STREAM] --- ATTEMPT %s/%s ---", attempt, self.max_retries)
+                if attempt > 1:
+                    time.sleep(self._retry_delay(queue, attempt))
+                
+                last_error = self._run_attempt(queue, engine, input_config, attempt)
+                if last_error is None:
+                    break
+            else:
+                self._report_retries_exhausted(queue, last_error)
+            
+        except Exception as e:
+            logger.exception("[STREAM] Fatal error in sync stream: %s", e)
+            queue.put({"type": "error", "error": f"Fatal error: {str(e)}"})
+        finally:
             queue.put(_STREAM_END)
+
+    async def _run_stream_attempts(
+        self,
+        queue: Any,
+        stop: threading.Event,
+        topic: str,
+        engine: str,
+        tool_ids: Optional[List[str]],
+        include_arxiv: bool
+    ) -> None:
+        """
+        Drive the stream's attempts from the event loop.
+        
+        Each attempt runs in a worker thread via to_thread (on the loop's
+        default executor, carrying the request's contextvars); the backoff
+        between attempts is an asyncio.sleep, so no thread is held while
+        a stream waits to retry. Once stop is set no further attempt starts.
+        """
+        try:
+            input_config = self._start_stream(queue, topic, engine, tool_ids, include_arxiv)
+            last_error = None
+            
+            for attempt in range(1, self.max_retries + 1):
+                logger.info("[STREAM] --- ATTEMPT %s/%s ---", attempt, self.max_retries)
+                if attempt > 1:
+                    await asyncio.sleep(self._retry_delay(queue, attempt))
+                    if stop.is_set():
+                        return
+                
+                last_error = await asyncio.to_thread(self._run_attempt, queue, engine, input_config, attempt, stop)
+                if last_error is None:
+                    break
+            else:
+                self._report_retries_exhausted(queue, last_error)
             
         except Exception as e:
-            logger.exception(f"[STREAM] Fatal error in sync stream: {e}")
+            logger.exception("[STREAM] Fatal error in stream: %s", e)
             queue.put({"type": "error", "error": f"Fatal error: {str(e)}"})
+        finally:
             queue.put(_STREAM_END)
 
     async def stream_async(
@@ -873,21 +1229,30 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         topic: str, 
         engine: Optional[str] = None,
         tool_ids: Optional[List[str]] = None,
-        include_arxiv: bool = True
+        include_arxiv: bool = True,
+        on_finished: Optional[Callable[[], None]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Async streaming analysis using a background thread for the sync SDK.
         
         This properly bridges the sync Subconscious SDK with async FastAPI/SSE:
-        1. Creates a queue for thread-safe communication
+        1. Creates an asyncio.Queue owned by the running loop
         2. Runs sync SDK in a thread pool (doesn't block event loop)
-        3. Async yields from queue with non-blocking waits
+        3. The thread hands events over with call_soon_threadsafe, so the
+           generator simply awaits queue.get() - one wakeup per event
+        
+        on_finished, if given, is called once the SDK work is over: when the
+        attempts task ends, which can be after this generator has returned,
+        or right away if the request is rejected before anything starts.
         """
         engine_to_use = engine or self.engine
         
-        # Validate engine
+        # Validate engine - the route's AnalyzeRequest already rejects unknown
+        # ids, so this and the tool check below only guard direct callers
         if engine_to_use not in VALID_ENGINE_IDS:
-            logger.error(f"[STREAM] Invalid engine: {engine_to_use}")
+            logger.error("[STREAM] Invalid engine: %s", engine_to_use)
+            if on_finished is not None:
+                on_finished()
             yield {
                 "type": "error",
                 "error": f"Invalid engine '{engine_to_use}'. Valid engines: {', '.join(VALID_ENGINE_IDS)}"
@@ -897,6 +1262,8 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         # Validate topic
         if not topic or not topic.strip():
             logger.error("[STREAM] Empty topic provided")
+            if on_finished is not None:
+                on_finished()
             yield {"type": "error", "error": "Research topic cannot be empty"}
             return
         
@@ -904,91 +1271,84 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         if tool_ids:
             invalid_tools = [t for t in tool_ids if t not in VALID_TOOL_IDS]
             if invalid_tools:
-                logger.warning(f"[STREAM] Invalid tool IDs ignored: {invalid_tools}")
+                logger.warning("[STREAM] Invalid tool IDs ignored: %s", invalid_tools)
                 tool_ids = [t for t in tool_ids if t in VALID_TOOL_IDS]
         
-        logger.info("=" * 70)
-        logger.info(f"[STREAM] Starting async stream for: {topic[:50]}...")
-        logger.info(f"[STREAM] Engine: {engine_to_use}")
-        logger.info(f"[STREAM] Tools: {tool_ids}")
-        logger.info("=" * 70)
+        logger.info("[STREAM] Starting async stream for: %s...", topic[:50])
+        logger.info("[STREAM] Engine: %s", engine_to_use)
+        logger.info("[STREAM] Tools: %s", tool_ids)
         
-        # Create queue for thread-safe communication
-        queue: Queue = Queue()
+        # Events are handed to the loop as they arrive - no polling. Bounded,
+        # so a slow client holds back the SDK rather than buffering the run
+        queue = _LoopQueue(asyncio.get_running_loop(), asyncio.Queue(), maxsize=_MAX_UNREAD_EVENTS)
         
-        # Start the sync stream in a background thread
-        loop = asyncio.get_event_loop()
-        thread_future = loop.run_in_executor(
-            _executor,
-            self._run_sync_stream,
+        # Drive the attempts as a task: each one runs the sync SDK in a worker
+        # thread (the loop's default executor, sized for streams in the app
+        # lifespan) while retry backoff waits on the loop
+        # Set when this generator finishes for any reason, so the SDK thread
+        # stops reading a stream nobody will consume
+        stop = threading.Event()
+        stream_task = asyncio.ensure_future(self._run_stream_attempts(
             queue,
+            stop,
             topic,
             engine_to_use,
             tool_ids,
             include_arxiv
-        )
+        ))
+        # Backstop in case the task dies without sending its end signal;
+        # queued after everything already put, so order is kept
+        stream_task.add_done_callback(lambda _: queue.put(_STREAM_END))
+        if on_finished is not None:
+            # The worker outlives this generator when the client leaves early
+            stream_task.add_done_callback(lambda _: on_finished())
         
         # Yield events from queue asynchronously
+        pending = None
         try:
             while True:
-                # Non-blocking wait for queue items
-                try:
-                    # Use asyncio.to_thread to check queue without blocking
-                    event = await asyncio.wait_for(
-                        asyncio.to_thread(queue.get, timeout=0.1),
-                        timeout=1.0
-                    )
-                    
-                    if event is _STREAM_END:
-                        logger.info("[STREAM] Received end signal")
-                        break
-                    
-                    yield event
-                    
-                except Empty:
-                    # Queue is empty, check if thread is still running
-                    if thread_future.done():
-                        # Thread finished, drain remaining queue items
-                        while True:
-                            try:
-                                event = queue.get_nowait()
-                                if event is _STREAM_END:
-                                    break
-                                yield event
-                            except Empty:
-                                break
-                        break
-                    # Thread still running, continue waiting
-                    await asyncio.sleep(0.01)
-                except asyncio.TimeoutError:
-                    # Timeout waiting for queue, check thread status
-                    if thread_future.done():
-                        # Drain remaining queue items
-                        while True:
-                            try:
-                                event = queue.get_nowait()
-                                if event is _STREAM_END:
-                                    break
-                                yield event
-                            except Empty:
-                                break
+                if pending is not None:
+                    event, pending = pending, None
+                else:
+                    event = await queue.get()
+                
+                if event is _STREAM_END:
+                    logger.info("[STREAM] Received end signal")
+                    break
+                
+                # If the client fell behind, collapse the backlog of progress
+                # ticks into the latest one - only its counters are shown
+                while _is_progress_tick(event) and not queue.empty():
+                    nxt = queue.get_nowait()
+                    if not _is_progress_tick(nxt):
+                        pending = nxt
                         break
-                    continue
+                    event = nxt
+                
+                yield event
                     
         except asyncio.CancelledError:
             logger.warning("[STREAM] Stream cancelled by client")
             raise
         except Exception as e:
-            logger.exception(f"[STREAM] Error in async stream: {e}")
+            logger.exception("[STREAM] Error in async stream: %s", e)
             yield {"type": "error", "error": str(e)}
         finally:
-            # Ensure thread completes
-            try:
-                await asyncio.wait_for(asyncio.shield(thread_future), timeout=5.0)
-            except asyncio.TimeoutError:
-                logger.warning("[STREAM] Background thread did not complete in time")
-            except Exception as e:
-                logger.warning(f"[STREAM] Error waiting for thread: {e}")
+            # Stop the SDK thread, unblocking it if it waits on a full queue
+            stop.set()
+            queue.close()
+            
+            # Ensure the stream task completes. After a normal end it already
+            # has - the end signal is its last act - so skip the shield and
+            # timer; otherwise wait a bounded time, as awaiting the task outright
+            # would hold a departed client until the SDK stream finished
+            if not stream_task.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(stream_task), timeout=5.0)
+                except asyncio.TimeoutError:
+                    logger.warning("[STREAM] Background stream did not complete in time")
+                except Exception as e:
+                    logger.warning("[STREAM] Error waiting for stream task: %s", e)
 
     # Keep sync version for backwards compatibility
     def stream(
@@ -1006,24 +1366,27 @@ Begin your research now. Be thorough, be accurate, and be helpful."""
         """
         logger.warning("[STREAM] Using deprecated sync stream() - consider using stream_async()")
         
-        queue: Queue = Queue()
+        events = _EventBuffer()
         
         # Run in current thread (blocking)
-        self._run_sync_stream(queue, topic, engine or self.engine, tool_ids, include_arxiv)
+        self._run_sync_stream(events, topic, engine or self.engine, tool_ids, include_arxiv)
         
-        # Yield all events from queue
-        while True:
-            try:
-                event = queue.get_nowait()
-                if event is _STREAM_END:
-                    break
-                yield event
-            except Empty:
+        # Everything is buffered by now - no other thread touches it
+        for event in events:
+            if event is _STREAM_END:
                 break
+            yield event
 
 
+@lru_cache(maxsize=8)
 def get_subconscious_service(engine: Optional[str] = None) -> SubconsciousService:
-    """Create a new Subconscious service instance."""
+    """
+    Get the Subconscious service for an engine, created once per engine.
+    
+    Safe to share across concurrent streams: the SDK client keeps no
+    per-request state (each call is a standalone requests call) and all
+    stream state lives in _run_attempt's locals.
+    """
     return SubconsciousService(engine=engine)
 
 
@@ -0,0 +1,4 @@
+# Utilities package
+from .timestamps import now_iso
+
+__all__ = ['now_iso']
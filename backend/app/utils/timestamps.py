@@ -0,0 +1,20 @@
+"""
+Timestamp helpers shared by the route modules.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+# ISO timestamp for response bodies, reformatted at most once per second
+_ts_cache: Dict[str, Any] = {"t": 0, "s": ""}
+
+
+def now_iso() -> str:
+    """Get the current local time as an ISO string with 1-second resolution."""
+    now = int(time.time())
+    cache = _ts_cache
+    if cache["t"] != now:
+        cache["s"] = datetime.fromtimestamp(now).isoformat()
+        cache["t"] = now
+    return cache["s"]